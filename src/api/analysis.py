@@ -0,0 +1,72 @@
+"""Move analysis endpoints."""
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from src.classification.move_quality import classify_move
+from src.core import settings
+from src.core.profiling import stage
+from src.models.analysis import MoveAnalysis, MoveAnalysisRequest
+from src.pipelines.bulk import MEDIA_TYPE, analyze_bulk, decode_bulk_request
+from src.pipelines.post_move import analyze_post_move, get_side_to_move
+
+router = APIRouter(prefix="/analysis", tags=["analysis"])
+
+
+@router.post("/move")
+def analyze_move(request: MoveAnalysisRequest) -> MoveAnalysis:
+    """Analyse a single move with the requested engine profile.
+
+    Returns:
+        Evaluations before and after the move, mover-relative delta and quality
+    """
+    try:
+        analysis = analyze_post_move(request.fen_before, request.move_uci, request.profile)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    with stage("classify_move"):
+        quality = classify_move(analysis, get_side_to_move(request.fen_before))  # type: ignore[arg-type]
+    return MoveAnalysis(**analysis, quality=quality)
+
+
+@router.post(
+    "/bulk",
+    response_class=StreamingResponse,
+    responses={200: {"content": {MEDIA_TYPE: {}}}},
+)
+async def analyze_bulk_moves(request: Request) -> StreamingResponse:
+    """Analyse many moves using the MessagePack bulk protocol.
+
+    See ``src.pipelines.bulk`` for the request and response layout.
+
+    Returns:
+        Streamed MessagePack chunks of columnar results
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type != MEDIA_TYPE:
+        raise HTTPException(status_code=415, detail=f"Expected {MEDIA_TYPE}")
+
+    # Reject oversized bodies before buffering them; chunked bodies have no length.
+    max_bytes = settings.bulk_max_body_bytes
+    too_large = HTTPException(status_code=413, detail=f"At most {max_bytes} bytes per request")
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+
+    try:
+        # Unpacking thousands of rows takes long enough to stall the event loop.
+        bulk = await run_in_threadpool(decode_bulk_request, bytes(body))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if len(bulk.fens) > settings.bulk_max_moves:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.bulk_max_moves} moves per request"
+        )
+    return StreamingResponse(analyze_bulk(bulk), media_type=MEDIA_TYPE)
@@ -0,0 +1,29 @@
+"""Shared FastAPI dependencies."""
+
+from functools import lru_cache
+
+from src.core import settings
+from src.profiles import PlayerProfileStore
+from src.sessions import SessionManager
+
+
+@lru_cache
+def get_profile_store() -> PlayerProfileStore:
+    """Get the process-wide player profile store.
+
+    Returns:
+        Player profile store configured from settings
+    """
+    return PlayerProfileStore(
+        settings.profile_db_path, time_pressure_seconds=settings.time_pressure_seconds
+    )
+
+
+@lru_cache
+def get_session_manager() -> SessionManager:
+    """Get the process-wide live session manager.
+
+    Returns:
+        Session manager configured from settings
+    """
+    return SessionManager()
@@ -1,16 +1,36 @@
 """FastAPI application entrypoint."""
 
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core import configure_logging, get_logger, settings
+from src.sessions import SessionManager
+
+from . import analysis, profiles, sessions
+from .dependencies import get_session_manager
+from .profiling import install_profiling
 
 logger = get_logger(__name__)
 
 
+async def reap_sessions(manager: SessionManager, interval: float) -> None:
+    """Close idle sessions periodically, so their engines exit without further traffic."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            closed = await run_in_threadpool(manager.expire)
+        except Exception as exc:
+            logger.warning(f"Closing idle sessions failed: {exc}")
+            continue
+        if closed:
+            logger.info(f"Closed {closed} idle sessions")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan context manager.
@@ -22,11 +42,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting Agentic Chess Coach API")
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Log Level: {settings.log_level}")
+    manager = get_session_manager()
+    reaper = asyncio.create_task(reap_sessions(manager, settings.session_reap_seconds))
 
     yield
 
     # Shutdown
     logger.info("Shutting down Agentic Chess Coach API")
+    reaper.cancel()
+    manager.close_all()
 
 
 def create_app() -> FastAPI:
@@ -51,7 +75,9 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing"],
     )
+    install_profiling(app)
 
     # Health check endpoint
     @app.get("/health", tags=["health"])
@@ -63,6 +89,10 @@ def create_app() -> FastAPI:
         """
         return {"status": "healthy", "version": "0.1.0"}
 
+    app.include_router(analysis.router)
+    app.include_router(profiles.router)
+    app.include_router(sessions.router)
+
     return app
 
 
@@ -0,0 +1,40 @@
+"""Player profile endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.models.profiles import AnalysedGame, PlayerProfile
+from src.profiles import PlayerProfileStore
+
+from .dependencies import get_profile_store
+
+router = APIRouter(prefix="/players", tags=["profiles"])
+
+
+@router.post("/{player_id}/games")
+def record_game(
+    player_id: str,
+    game: AnalysedGame,
+    store: PlayerProfileStore = Depends(get_profile_store),
+) -> dict[str, bool]:
+    """Fold an analysed game into the player's profile.
+
+    Returns:
+        Whether the game was newly recorded
+    """
+    return {"recorded": store.record_game(player_id, game)}
+
+
+@router.get("/{player_id}/profile")
+def get_profile(
+    player_id: str,
+    store: PlayerProfileStore = Depends(get_profile_store),
+) -> PlayerProfile:
+    """Read a player's precomputed profile.
+
+    Returns:
+        Aggregated player profile
+    """
+    profile = store.get_profile(player_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Unknown player")
+    return profile
@@ -0,0 +1,86 @@
+"""Per-request profiling middleware.
+
+Profiled responses carry their stage timings in a ``Server-Timing`` header.
+Headers are sent before a streamed body is produced, so for streaming routes
+such as ``/analysis/bulk`` the header only covers the work done before the
+response started; their full stage breakdown is logged once the body ends.
+The middleware is only installed when profiling is enabled in settings, so
+unprofiled deployments never run it.
+"""
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from fastapi import FastAPI, Request, Response
+
+from src.core import get_logger, settings
+from src.core.profiling import RequestProfile, format_samples, start_profile, stop_profile
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+
+
+def _wants_profile(request: Request) -> bool:
+    if settings.profiling_enabled:
+        return True
+    value = request.headers.get(PROFILE_HEADER, "")
+    return value.lower() not in ("", "0", "false", "no")
+
+
+def _report(request: Request, profile: RequestProfile, header_stages: int) -> None:
+    samples = profile.finish()
+    elapsed_ms = profile.elapsed_ms()
+    slow_ms = settings.profiling_slow_ms
+    if slow_ms is not None and elapsed_ms > slow_ms:
+        logger.warning(
+            f"Slow request {request.method} {request.url.path} took {elapsed_ms:.1f}ms "
+            f"({profile.server_timing()})\n{format_samples(samples)}"
+        )
+    elif len(profile.stages) > header_stages:
+        logger.info(
+            f"Streamed request {request.method} {request.url.path} took {elapsed_ms:.1f}ms "
+            f"({profile.server_timing()})"
+        )
+
+
+async def profile_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Profile a request when profiling is forced on or asked for by the client."""
+    if not _wants_profile(request):
+        return await call_next(request)
+
+    slow_ms = settings.profiling_slow_ms
+    profile = RequestProfile(None if slow_ms is None else settings.profiling_sample_interval_ms)
+    token = start_profile(profile)
+    try:
+        response = await call_next(request)
+    except BaseException:
+        profile.finish()
+        raise
+    finally:
+        # The body keeps recording into the profile through its copied context.
+        stop_profile(token)
+
+    response.headers["Server-Timing"] = profile.server_timing()
+    header_stages = len(profile.stages)
+    body: AsyncIterator[bytes] | None = getattr(response, "body_iterator", None)
+    if body is None:
+        _report(request, profile, header_stages)
+        return response
+
+    async def report_after_body() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            _report(request, profile, header_stages)
+
+    response.body_iterator = report_after_body()  # type: ignore[attr-defined]
+    return response
+
+
+def install_profiling(app: FastAPI) -> None:
+    """Add the profiling middleware if profiling is enabled in settings."""
+    if settings.profiling_enabled or settings.profiling_header_enabled:
+        app.middleware("http")(profile_requests)
@@ -0,0 +1,100 @@
+"""Live game session endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from stockfish import StockfishException
+
+from src.classification.move_quality import classify_move
+from src.core.profiling import stage
+from src.models.analysis import MoveAnalysis
+from src.models.sessions import SessionCreateRequest, SessionMoveRequest, SessionState
+from src.sessions import GameSession, SessionCapacityError, SessionManager, SessionNotFoundError
+
+from .dependencies import get_session_manager
+
+router = APIRouter(prefix="/sessions", tags=["sessions"])
+
+
+def _state(session: GameSession) -> SessionState:
+    return SessionState(
+        session_id=session.session_id,
+        profile=session.profile,
+        fen=session.fen,
+        moves=list(session.moves),
+    )
+
+
+def _get_session(manager: SessionManager, session_id: str) -> GameSession:
+    try:
+        return manager.get(session_id)
+    except SessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Unknown or expired session") from exc
+
+
+@router.post("", status_code=201)
+def open_session(
+    request: SessionCreateRequest,
+    manager: SessionManager = Depends(get_session_manager),
+) -> SessionState:
+    """Open a live game session.
+
+    Returns:
+        The new session's state
+    """
+    try:
+        session = manager.open(request.fen, request.profile)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except SessionCapacityError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    return _state(session)
+
+
+@router.get("/{session_id}")
+def get_session(
+    session_id: str,
+    manager: SessionManager = Depends(get_session_manager),
+) -> SessionState:
+    """Read a live session's state.
+
+    Returns:
+        Current position and moves played
+    """
+    return _state(_get_session(manager, session_id))
+
+
+@router.post("/{session_id}/moves")
+def play_move(
+    session_id: str,
+    request: SessionMoveRequest,
+    manager: SessionManager = Depends(get_session_manager),
+) -> MoveAnalysis:
+    """Play a move in a live session and analyse it.
+
+    Returns:
+        Evaluations before and after the move, mover-relative delta and quality
+    """
+    session = _get_session(manager, session_id)
+    try:
+        analysis, side_to_move = session.play(request.move_uci)
+    except SessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Unknown or expired session") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except (StockfishException, BrokenPipeError) as exc:
+        raise HTTPException(status_code=503, detail="Session engine unavailable") from exc
+    with stage("classify_move"):
+        quality = classify_move(analysis, side_to_move)
+    return MoveAnalysis(**analysis, quality=quality)
+
+
+@router.delete("/{session_id}", status_code=204)
+def close_session(
+    session_id: str,
+    manager: SessionManager = Depends(get_session_manager),
+) -> Response:
+    """Close a live session and release its engine."""
+    try:
+        manager.close(session_id)
+    except SessionNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Unknown or expired session") from exc
+    return Response(status_code=204)
@@ -0,0 +1,65 @@
+"""In-process cache of post-move analyses."""
+
+import threading
+import typing
+from collections import OrderedDict
+
+from src.core import settings
+
+CacheKey = tuple[str, str, str]
+
+
+class EvaluationCache:
+    """Thread-safe LRU cache of post-move analyses.
+
+    Entries are keyed by engine profile, position and move, so results
+    computed under one search budget are never served for another. Lookups
+    are counted in ``hits`` and ``misses``.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[CacheKey, dict[str, typing.Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, profile: str, fen: str, move_uci: str) -> dict[str, typing.Any] | None:
+        """Look up a cached analysis.
+
+        Returns:
+            A copy of the cached analysis, or None on a miss
+        """
+        key = (profile, fen, move_uci)
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return dict(analysis)
+
+    def put(self, profile: str, fen: str, move_uci: str, analysis: dict[str, typing.Any]) -> None:
+        """Store an analysis, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        key = (profile, fen, move_uci)
+        with self._lock:
+            self._entries[key] = dict(analysis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all cached analyses and reset the lookup counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+evaluation_cache = EvaluationCache(settings.evaluation_cache_size)
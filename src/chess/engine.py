@@ -0,0 +1,222 @@
+"""Stockfish engine profiles and warm engine reuse."""
+
+import contextlib
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from stockfish import Stockfish, StockfishException
+
+from src.core import settings
+from src.core.config import EngineProfile
+from src.core.profiling import stage
+
+DEFAULT_DEPTH = 15
+
+
+class ProfiledStockfish(Stockfish):
+    """Stockfish configured once for an engine profile.
+
+    Searches are bounded by the profile's movetime when set, otherwise by its depth.
+    Writes to the engine are serialised, so ``stop`` can be sent from another
+    thread while a search runs.
+    """
+
+    def __init__(self, path: str, profile: EngineProfile) -> None:
+        self._write_lock = threading.RLock()
+        self.cancelled: threading.Event | None = None
+        self.profile = profile
+        super().__init__(
+            path,
+            depth=profile.depth or DEFAULT_DEPTH,
+            parameters=profile.uci_options,
+        )
+
+    def _put(self, command: str) -> None:
+        with self._write_lock:
+            super()._put(command)
+
+    def _go(self) -> None:
+        with self._write_lock:
+            if self.cancelled is not None and self.cancelled.is_set():
+                # A stop sent before this go would be ignored, so keep the search trivial.
+                self._put("go depth 1")
+            elif self.profile.movetime_ms is not None:
+                self._go_time(self.profile.movetime_ms)
+            else:
+                super()._go()
+
+    def stop(self) -> None:
+        """Stop the running search.
+
+        Set ``cancelled`` first: searches started after that run at depth 1,
+        so a stop that overtakes its ``go`` is not lost.
+        """
+        self._put("stop")
+
+    def get_top_moves(self, num_top_moves: int | None = None) -> list[dict]:
+        """Top lines of the current position, defaulting to the profile's MultiPV.
+
+        The wrapper only keeps lines reported at exactly ``self.depth``, which a
+        movetime search need not end on, so for movetime profiles the last
+        score reported for each line is used instead.
+        """
+        count = num_top_moves or self.profile.multipv
+        if self.profile.movetime_ms is None:
+            return super().get_top_moves(count)
+
+        previous_multipv = self._parameters["MultiPV"]
+        if count != previous_multipv:
+            self._set_option("MultiPV", count)
+        self._go()
+        latest: dict[int, list[str]] = {}
+        while (tokens := self._read_line().split())[:1] != ["bestmove"]:
+            if tokens[:1] == ["info"] and "multipv" in tokens and "pv" in tokens:
+                rank = int(tokens[tokens.index("multipv") + 1])
+                if rank <= count:
+                    latest[rank] = tokens
+        if count != previous_multipv:
+            self._set_option("MultiPV", previous_multipv)
+
+        sign = 1 if self.get_fen_position().split()[1] == "w" else -1
+        top_moves = []
+        for rank in sorted(latest):
+            tokens = latest[rank]
+            kind, value = tokens[tokens.index("score") + 1 : tokens.index("score") + 3]
+            top_moves.append(
+                {
+                    "Move": tokens[tokens.index("pv") + 1],
+                    "Centipawn": int(value) * sign if kind == "cp" else None,
+                    "Mate": int(value) * sign if kind == "mate" else None,
+                }
+            )
+        return top_moves
+
+    def set_game_position(self, moves: list[str], start_fen: str | None = None) -> None:
+        """Set the position as a start position plus the moves played since.
+
+        Unlike ``set_fen_position`` this keeps the transposition table, so
+        an engine following a single game stays warm from move to move.
+
+        Args:
+            moves: Moves played from the start position, in UCI notation
+            start_fen: Start position, or None for the standard initial position
+        """
+        self._prepare_for_new_position(False)
+        command = "position startpos" if start_fen is None else f"position fen {start_fen}"
+        if moves:
+            command += f" moves {' '.join(moves)}"
+        self._put(command)
+
+    def quit(self) -> None:
+        """Ask the engine process to exit."""
+        self._put("quit")
+
+
+class EnginePool:
+    """Per-profile pool of configured engines.
+
+    Engines are created with their profile's UCI options once and returned to
+    the pool after use, so repeated requests skip process startup and
+    ``setoption`` round-trips. At most ``max_engines`` engines per profile
+    are checked out at once; further checkouts block until one is returned.
+    Every healthy engine is kept, so a profile never holds more than
+    ``max_engines`` engines and steady load never respawns them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        profiles: dict[str, EngineProfile],
+        default_profile: str,
+    ) -> None:
+        self.path = path
+        self.profiles = profiles
+        self.default_profile = default_profile
+        self._idle: dict[str, deque[ProfiledStockfish]] = {name: deque() for name in profiles}
+        self._slots = {
+            name: threading.BoundedSemaphore(profile.max_engines)
+            for name, profile in profiles.items()
+        }
+        self._lock = threading.Lock()
+
+    def resolve(self, profile: str | None) -> str:
+        """Resolve a requested profile name, falling back to the default.
+
+        Raises:
+            ValueError: If the profile is not configured
+        """
+        name = profile or self.default_profile
+        if name not in self.profiles:
+            raise ValueError(f"Unknown engine profile: {name}")
+        return name
+
+    @contextmanager
+    def checkout(self, profile: str | None = None) -> Iterator[ProfiledStockfish]:
+        """Borrow an engine configured for ``profile``.
+
+        Blocks while the profile's ``max_engines`` engines are all checked
+        out. Engines whose process failed while checked out are shut down
+        instead of being returned to the pool.
+
+        Args:
+            profile: Engine profile name, or None for the default profile
+
+        Yields:
+            Configured engine, exclusively owned until the block exits
+        """
+        name = self.resolve(profile)
+        slots = self._slots[name]
+        with stage("engine_checkout"):
+            slots.acquire()
+            try:
+                with self._lock:
+                    idle = self._idle[name]
+                    engine = idle.pop() if idle else None
+                if engine is None:
+                    engine = ProfiledStockfish(self.path, self.profiles[name])
+            except BaseException:
+                slots.release()
+                raise
+
+        healthy = True
+        try:
+            yield engine
+        except (StockfishException, BrokenPipeError):
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                with self._lock:
+                    self._idle[name].append(engine)
+            else:
+                _discard(engine)
+            slots.release()
+
+    def idle_count(self, profile: str | None = None) -> int:
+        """Number of warm engines waiting in the pool for a profile."""
+        with self._lock:
+            return len(self._idle[self.resolve(profile)])
+
+    def clear(self) -> None:
+        """Shut down all idle engines."""
+        with self._lock:
+            engines = [engine for idle in self._idle.values() for engine in idle]
+            for idle in self._idle.values():
+                idle.clear()
+        for engine in engines:
+            _discard(engine)
+
+
+def _discard(engine: ProfiledStockfish) -> None:
+    # Quit explicitly: Stockfish.__del__ would busy-wait for a still running process.
+    with contextlib.suppress(Exception):
+        engine.quit()
+
+
+engine_pool = EnginePool(
+    settings.stockfish_path,
+    settings.engine_profiles,
+    settings.default_engine_profile,
+)
@@ -0,0 +1,284 @@
+"""Opening tree index built from analysed games.
+
+The index is a flat little-endian file designed to be memory-mapped:
+
+    header     magic, version, position count, move count
+    positions  fixed-size records sorted by Zobrist key
+    moves      fixed-size records, grouped per position
+
+Lookups binary-search the position records in place, so opening the book
+costs nothing up front and a query touches only a few pages.
+"""
+
+import mmap
+import struct
+import threading
+import typing
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+
+import chess
+import chess.polyglot
+
+from src.classification.move_quality import MoveQuality, classify_move
+from src.core import settings
+from src.models.profiles import AnalysedMove
+
+MAGIC = b"ACOB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHxxII")
+# key, games, first move index, move count, evaluation type, evaluation value
+_POSITION = struct.Struct("<QIIHBxi")
+# encoded move, count, quality counts in MoveQuality order
+_MOVE = struct.Struct(f"<HI{len(MoveQuality)}I")
+
+_EVAL_NONE, _EVAL_CP, _EVAL_MATE = 0, 1, 2
+_QUALITIES = list(MoveQuality)
+
+
+class BookMove(typing.NamedTuple):
+    """A move played from a book position."""
+
+    move_uci: str
+    count: int
+    qualities: dict[MoveQuality, int]
+
+
+class BookEntry(typing.NamedTuple):
+    """Aggregated data for a book position."""
+
+    key: int
+    games: int
+    evaluation: dict[str, typing.Any] | None
+    moves: list[BookMove]
+
+
+def encode_move(move: chess.Move) -> int:
+    """Pack a move into 15 bits: from, to and promotion piece type."""
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def decode_move(code: int) -> chess.Move:
+    """Inverse of ``encode_move``."""
+    return chess.Move(code & 0x3F, code >> 6 & 0x3F, (code >> 12) or None)
+
+
+class _PositionStats:
+    def __init__(self) -> None:
+        self.games = 0
+        self.cp_total = 0
+        self.cp_count = 0
+        self.mate: int | None = None
+        self.mate_count = 0
+        self.moves: dict[int, list[int]] = defaultdict(lambda: [0] * (1 + len(_QUALITIES)))
+
+    def add_evaluation(self, evaluation: dict[str, typing.Any]) -> None:
+        if evaluation["type"] == "cp":
+            self.cp_total += evaluation["value"]
+            self.cp_count += 1
+        else:
+            self.mate = evaluation["value"]
+            self.mate_count += 1
+
+    def evaluation(self) -> tuple[int, int]:
+        if self.cp_count and self.cp_count >= self.mate_count:
+            return _EVAL_CP, round(self.cp_total / self.cp_count)
+        if self.mate is not None:
+            return _EVAL_MATE, self.mate
+        return _EVAL_NONE, 0
+
+
+def build_opening_book(
+    games: Iterable[Iterable[AnalysedMove]],
+    path: str | Path,
+    max_ply: int | None = None,
+) -> int:
+    """Build an opening book file from analysed games.
+
+    Args:
+        games: Games as sequences of analysed moves
+        path: Output file
+        max_ply: Deepest ply indexed, defaulting to settings
+
+    Returns:
+        Number of positions written
+    """
+    max_ply = settings.opening_book_max_ply if max_ply is None else max_ply
+    positions: dict[int, _PositionStats] = defaultdict(_PositionStats)
+
+    for game in games:
+        for move in game:
+            board = chess.Board(move.fen_before)
+            if board.ply() >= max_ply:
+                break
+            side_to_move: typing.Literal["w", "b"] = "w" if board.turn else "b"
+            stats = positions[chess.polyglot.zobrist_hash(board)]
+            stats.games += 1
+            stats.add_evaluation(move.before.model_dump())
+
+            quality = classify_move(move.model_dump(), side_to_move)
+            counters = stats.moves[encode_move(chess.Move.from_uci(move.move_uci))]
+            counters[0] += 1
+            counters[1 + _QUALITIES.index(quality)] += 1
+
+            board.push_uci(move.move_uci)
+            positions[chess.polyglot.zobrist_hash(board)].add_evaluation(move.after.model_dump())
+
+    keys = sorted(positions)
+    move_count = sum(len(positions[key].moves) for key in keys)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, len(keys), move_count))
+        first_move = 0
+        for key in keys:
+            stats = positions[key]
+            eval_type, eval_value = stats.evaluation()
+            out.write(
+                _POSITION.pack(
+                    key, stats.games, first_move, len(stats.moves), eval_type, eval_value
+                )
+            )
+            first_move += len(stats.moves)
+        for key in keys:
+            moves = positions[key].moves
+            for code, counters in sorted(moves.items(), key=lambda item: -item[1][0]):
+                out.write(_MOVE.pack(code, *counters))
+    return len(keys)
+
+
+class OpeningBook:
+    """Read-only, memory-mapped opening book."""
+
+    def __init__(self, path: str | Path, min_games: int | None = None) -> None:
+        self.min_games = settings.opening_book_min_games if min_games is None else min_games
+        with open(path, "rb") as book_file:
+            self._mmap = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._positions, self._moves = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not an opening book: {path}")
+        self._moves_offset = _HEADER.size + self._positions * _POSITION.size
+
+    def __len__(self) -> int:
+        return int(self._positions)
+
+    def _find(self, key: int) -> tuple[int, ...] | None:
+        low, high = 0, self._positions
+        while low < high:
+            middle = (low + high) // 2
+            record = _POSITION.unpack_from(self._mmap, _HEADER.size + middle * _POSITION.size)
+            if record[0] < key:
+                low = middle + 1
+            elif record[0] > key:
+                high = middle
+            else:
+                return typing.cast(tuple[int, ...], record)
+        return None
+
+    def _evaluation(self, record: tuple[int, ...]) -> dict[str, typing.Any] | None:
+        eval_type, eval_value = record[4], record[5]
+        if eval_type == _EVAL_NONE:
+            return None
+        return {"type": "cp" if eval_type == _EVAL_CP else "mate", "value": eval_value}
+
+    def lookup(self, board: chess.Board) -> BookEntry | None:
+        """Look up a position.
+
+        Returns:
+            The book entry, or None if the position is not in the book
+        """
+        record = self._find(chess.polyglot.zobrist_hash(board))
+        if record is None:
+            return None
+        key, games, first_move, move_count = record[:4]
+        moves = []
+        for index in range(first_move, first_move + move_count):
+            code, count, *qualities = _MOVE.unpack_from(
+                self._mmap, self._moves_offset + index * _MOVE.size
+            )
+            moves.append(
+                BookMove(
+                    decode_move(code).uci(),
+                    count,
+                    dict(zip(_QUALITIES, qualities, strict=True)),
+                )
+            )
+        return BookEntry(key, games, self._evaluation(record), moves)
+
+    def evaluations(
+        self, board: chess.Board, move: chess.Move
+    ) -> tuple[dict[str, typing.Any], dict[str, typing.Any]] | None:
+        """Stored evaluations around a move from a well-known position.
+
+        Args:
+            board: Position before the move
+            move: Move played
+
+        Returns:
+            Evaluations before and after the move, or None when the move is
+            illegal, the position is not well known or either evaluation is
+            missing
+        """
+        if move not in board.legal_moves:
+            return None
+        record = self._find(chess.polyglot.zobrist_hash(board))
+        if record is None or record[1] < self.min_games:
+            return None
+        evaluation_before = self._evaluation(record)
+        if evaluation_before is None:
+            return None
+
+        board.push(move)
+        try:
+            child = self._find(chess.polyglot.zobrist_hash(board))
+        finally:
+            board.pop()
+        evaluation_after = None if child is None else self._evaluation(child)
+        if evaluation_after is None:
+            return None
+        return evaluation_before, evaluation_after
+
+    def close(self) -> None:
+        """Unmap the book file."""
+        self._mmap.close()
+
+
+_opening_book: OpeningBook | None = None
+_opening_book_lock = threading.Lock()
+
+
+def get_opening_book() -> OpeningBook | None:
+    """Get the configured opening book, if there is one.
+
+    Only an opened book is kept, so a book file that appears after startup
+    is picked up by the next call.
+
+    Returns:
+        The memory-mapped book, or None when no book is configured
+    """
+    global _opening_book
+    if _opening_book is None:
+        with _opening_book_lock:
+            path = settings.opening_book_path
+            if _opening_book is None and path is not None and Path(path).exists():
+                _opening_book = OpeningBook(path)
+    return _opening_book
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    # Usage: python -m src.chess.opening_book GAMES.jsonl OUTPUT
+    # Each input line holds one game as a JSON list of analysed moves.
+    with open(sys.argv[1]) as archive:
+        count = build_opening_book(
+            (
+                [AnalysedMove(**move) for move in json.loads(line)]
+                for line in archive
+                if line.strip()
+            ),
+            sys.argv[2],
+        )
+    print(f"Wrote {count} positions to {sys.argv[2]}")
@@ -0,0 +1,176 @@
+"""Compact binary encoding of FEN positions.
+
+A packed position is laid out little-endian as:
+
+    occupancy  8 bytes, one per rank from the 8th down, with bit n set
+               when file n is occupied
+    pieces     one nibble per occupied square in FEN order, low nibble
+               first (piece type, plus 8 for black), padded to a byte
+    state      flags (side to move, castling rights), en passant square
+               (255 for none), halfmove clock, fullmove number
+
+which takes 14 bytes plus one byte per two pieces, against 40-90 bytes of
+FEN. Only standard castling rights can be encoded.
+
+Packing works on the FEN text directly, rank by rank through lookup
+tables, rather than through ``chess.Board``, whose parsing would cost more
+than the encoding saves.
+"""
+
+import struct
+from functools import lru_cache
+
+import chess
+
+_OCCUPANCY = struct.Struct("<8B")
+_STATE = struct.Struct("<BBHH")
+_NO_EP_SQUARE = 255
+_BLACK_PIECE = 8
+_PIECE_CODES = {
+    symbol: chess.PIECE_SYMBOLS.index(symbol.lower()) | (0 if symbol.isupper() else _BLACK_PIECE)
+    for symbol in "PNBRQKpnbrqk"
+}
+# Piece symbols of both nibbles of a byte, "?" for invalid codes
+_BYTE_SYMBOLS = [
+    "".join(
+        next((symbol for symbol, code in _PIECE_CODES.items() if code == nibble), "?")
+        for nibble in (byte & 0xF, byte >> 4)
+    )
+    for byte in range(256)
+]
+_PAIR_CODES = {symbols: byte for byte, symbols in enumerate(_BYTE_SYMBOLS) if "?" not in symbols}
+_PAIR_CODES.update({symbol + "?": code for symbol, code in _PIECE_CODES.items()})
+# Castling flag bits 1-4, in FEN order
+_CASTLING = "KQkq"
+_CASTLING_TEXT = [
+    "".join(char for bit, char in enumerate(_CASTLING) if flags >> bit & 1) or "-"
+    for flags in range(16)
+]
+_CASTLING_FLAGS = {text: flags << 1 for flags, text in enumerate(_CASTLING_TEXT)}
+
+
+def _rank_template(occupancy: int) -> str:
+    """Rank text for an occupancy byte, with a format placeholder per piece."""
+    parts = []
+    empty = 0
+    for file_index in range(8):
+        if occupancy >> file_index & 1:
+            parts.append(f"{empty or ''}{{}}")
+            empty = 0
+        else:
+            empty += 1
+    parts.append(str(empty or ""))
+    return "".join(parts)
+
+
+_RANK_TEMPLATES = [_rank_template(occupancy) for occupancy in range(256)]
+
+
+@lru_cache(maxsize=4096)
+def _pack_rank(rank: str) -> tuple[int, str]:
+    occupancy = 0
+    pieces = []
+    file_index = 0
+    for char in rank:
+        if char in "12345678":
+            file_index += int(char)
+            continue
+        if char not in _PIECE_CODES or file_index > 7:
+            raise ValueError(f"Invalid rank {rank!r}")
+        occupancy |= 1 << file_index
+        pieces.append(char)
+        file_index += 1
+    if file_index != 8:
+        raise ValueError(f"Invalid rank {rank!r}")
+    return occupancy, "".join(pieces)
+
+
+@lru_cache(maxsize=4096)
+def _unpack_rank(occupancy: int, symbols: str) -> str:
+    return _RANK_TEMPLATES[occupancy].format(*symbols)
+
+
+def pack_fen(fen: str) -> bytes:
+    """Pack a FEN position into its compact binary form.
+
+    Raises:
+        ValueError: If the FEN is malformed, uses non-standard castling
+            rights or has out-of-range move counters
+    """
+    fields = fen.split()
+    if len(fields) != 6:
+        raise ValueError(f"Expected 6 FEN fields: {fen!r}")
+    placement, turn, castling, ep_square, halfmove_clock, fullmove_number = fields
+
+    ranks = placement.split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"Expected 8 ranks: {fen!r}")
+    occupancy = []
+    symbols = []
+    for rank in ranks:
+        rank_occupancy, rank_symbols = _pack_rank(rank)
+        occupancy.append(rank_occupancy)
+        symbols.append(rank_symbols)
+    pieces_text = "".join(symbols)
+    if len(pieces_text) % 2:
+        pieces_text += "?"
+    pieces = bytes(
+        _PAIR_CODES[low + high]
+        for low, high in zip(pieces_text[::2], pieces_text[1::2], strict=True)
+    )
+
+    if turn not in ("w", "b"):
+        raise ValueError(f"Invalid side to move: {fen!r}")
+    if castling not in _CASTLING_FLAGS:
+        raise ValueError(f"Invalid or non-standard castling rights: {fen!r}")
+    flags = _CASTLING_FLAGS[castling] | (turn == "w")
+
+    if ep_square == "-":
+        ep_index = _NO_EP_SQUARE
+    elif ep_square in chess.SQUARE_NAMES:
+        ep_index = chess.SQUARE_NAMES.index(ep_square)
+    else:
+        raise ValueError(f"Invalid en passant square: {fen!r}")
+
+    try:
+        state = _STATE.pack(flags, ep_index, int(halfmove_clock), int(fullmove_number))
+    except struct.error as exc:
+        raise ValueError(f"Cannot pack move counters: {fen!r}") from exc
+    return _OCCUPANCY.pack(*occupancy) + pieces + state
+
+
+def unpack_fen(data: bytes) -> str:
+    """Inverse of ``pack_fen``.
+
+    Raises:
+        ValueError: If ``data`` is not a packed position
+    """
+    if len(data) < _OCCUPANCY.size + _STATE.size:
+        raise ValueError("Packed position is truncated")
+    occupancy = _OCCUPANCY.unpack_from(data)
+    piece_count = sum(map(int.bit_count, occupancy))
+    pieces_end = _OCCUPANCY.size + (piece_count + 1) // 2
+    if len(data) != pieces_end + _STATE.size:
+        raise ValueError("Packed position has the wrong length")
+
+    symbols = "".join(map(_BYTE_SYMBOLS.__getitem__, data[_OCCUPANCY.size : pieces_end]))
+    if "?" in symbols[:piece_count]:
+        raise ValueError("Invalid piece code")
+    ranks = []
+    index = 0
+    for rank_occupancy in occupancy:
+        count = rank_occupancy.bit_count()
+        ranks.append(_unpack_rank(rank_occupancy, symbols[index : index + count]))
+        index += count
+
+    flags, ep_index, halfmove_clock, fullmove_number = _STATE.unpack_from(data, pieces_end)
+    if ep_index == _NO_EP_SQUARE:
+        ep_square = "-"
+    elif ep_index < 64:
+        ep_square = chess.SQUARE_NAMES[ep_index]
+    else:
+        raise ValueError(f"Invalid en passant square {ep_index}")
+    return (
+        f"{'/'.join(ranks)} {'w' if flags & 1 else 'b'} {_CASTLING_TEXT[flags >> 1 & 0xF]} "
+        f"{ep_square} {halfmove_clock} {fullmove_number}"
+    )
@@ -2,10 +2,47 @@
 
 from typing import Literal
 
-from pydantic import Field
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class EngineProfile(BaseModel):
+    """Search budget and UCI options for a named engine configuration."""
+
+    depth: int | None = Field(default=None, ge=1, description="Fixed search depth")
+    movetime_ms: int | None = Field(default=None, ge=1, description="Fixed search time (ms)")
+    threads: int = Field(default=1, ge=1, description="UCI Threads option")
+    hash_mb: int = Field(default=16, ge=1, description="UCI Hash option (MB)")
+    skill_level: int = Field(default=20, ge=0, le=20, description="UCI Skill Level option")
+    multipv: int = Field(default=1, ge=1, description="Lines returned by get_top_moves by default")
+    max_engines: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum engines checked out at once; further checkouts wait",
+    )
+
+    @model_validator(mode="after")
+    def check_search_limit(self) -> "EngineProfile":
+        """Ensure exactly one of depth or movetime bounds the search."""
+        if (self.depth is None) == (self.movetime_ms is None):
+            raise ValueError("Engine profile needs exactly one of depth or movetime_ms")
+        return self
+
+    @property
+    def uci_options(self) -> dict[str, int]:
+        """UCI options to apply when the engine is created.
+
+        MultiPV is left at 1: ``get_evaluation`` keeps the score of the last
+        ``info`` line, which belongs to the worst line when MultiPV is higher.
+        ``get_top_moves`` sets MultiPV for its own search instead.
+        """
+        return {
+            "Threads": self.threads,
+            "Hash": self.hash_mb,
+            "Skill Level": self.skill_level,
+        }
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -43,6 +80,134 @@ class Settings(BaseSettings):
         default="/usr/local/bin/stockfish",
         description="Path to Stockfish binary",
     )
+    engine_profiles: dict[str, EngineProfile] = Field(
+        default={
+            "blitz": EngineProfile(depth=8),
+            "standard": EngineProfile(depth=15),
+            "deep": EngineProfile(depth=22, threads=4, hash_mb=256, max_engines=2),
+        },
+        description="Named engine configurations selectable per request",
+    )
+    default_engine_profile: str = Field(
+        default="standard",
+        description="Engine profile used when a request does not name one",
+    )
+    evaluation_cache_size: int = Field(
+        default=10_000,
+        ge=0,
+        description="Maximum post-move analyses kept in the in-process evaluation cache",
+    )
+    speculative_candidates: int = Field(
+        default=3,
+        ge=1,
+        description="Candidate replies pre-evaluated while the user is thinking",
+    )
+    speculative_niceness: int = Field(
+        default=19,
+        ge=0,
+        le=19,
+        description="Scheduling niceness applied to speculative engine processes",
+    )
+
+    # Opening Book
+    opening_book_path: str | None = Field(
+        default=None,
+        description="Path to the opening book index; book lookups are skipped when unset",
+    )
+    opening_book_min_games: int = Field(
+        default=20,
+        ge=1,
+        description="Occurrences needed before a book position is answered without a search",
+    )
+    opening_book_max_ply: int = Field(
+        default=24,
+        ge=1,
+        description="Deepest ply indexed when building the opening book",
+    )
+
+    # Live Sessions
+    session_idle_seconds: float = Field(
+        default=900.0,
+        gt=0,
+        description="Idle time after which a live game session is closed",
+    )
+    session_reap_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Interval between sweeps that close idle sessions",
+    )
+    session_memory_mb: int = Field(
+        default=2048,
+        ge=0,
+        description="Approximate memory budget (MB) for engines held by live sessions",
+    )
+    session_speculation: bool = Field(
+        default=False,
+        description="Pre-analyse likely replies while a live session waits for a move",
+    )
+
+    # Player Profiles
+    profile_db_path: str = Field(
+        default="data/profiles.db",
+        description="Path to the SQLite database holding aggregated player profiles",
+    )
+    time_pressure_seconds: float = Field(
+        default=30.0,
+        description="Remaining clock time (seconds) below which a move counts as time pressure",
+    )
+
+    # Puzzle Mining
+    puzzle_db_path: str = Field(
+        default="data/puzzles.db",
+        description="Path to the SQLite puzzle store",
+    )
+    puzzle_verification_depth: int = Field(
+        default=16,
+        ge=1,
+        description="Search depth used to verify that a puzzle has a unique solution",
+    )
+    puzzle_min_gap_cp: int = Field(
+        default=150,
+        ge=0,
+        description="Minimum centipawn gap between the best and second best reply",
+    )
+
+    # Bulk Analysis
+    bulk_chunk_size: int = Field(
+        default=256,
+        ge=1,
+        description="Rows per streamed chunk of a bulk analysis response",
+    )
+    bulk_max_moves: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of moves in one bulk analysis request",
+    )
+    bulk_max_body_bytes: int = Field(
+        default=2_000_000,
+        ge=1,
+        description="Maximum size of a bulk analysis request body",
+    )
+
+    # Request Profiling
+    profiling_enabled: bool = Field(
+        default=False,
+        description="Report a per-stage timing breakdown for every request",
+    )
+    profiling_header_enabled: bool = Field(
+        default=False,
+        description="Report a timing breakdown for requests sent with an X-Profile header",
+    )
+    profiling_slow_ms: float | None = Field(
+        default=None,
+        gt=0,
+        description="Sample the stacks of profiled requests and log them above this latency",
+    )
+    profiling_sample_interval_ms: float = Field(
+        default=5.0,
+        gt=0,
+        description="Stack sampling interval for slow request profiles",
+    )
 
     # API Configuration
     api_host: str = Field(
@@ -64,6 +229,13 @@ class Settings(BaseSettings):
         description="Allowed CORS origins",
     )
 
+    @model_validator(mode="after")
+    def check_default_engine_profile(self) -> "Settings":
+        """Ensure the default engine profile is defined."""
+        if self.default_engine_profile not in self.engine_profiles:
+            raise ValueError(f"Unknown default engine profile: {self.default_engine_profile}")
+        return self
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
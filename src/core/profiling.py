@@ -0,0 +1,139 @@
+"""Opt-in per-request profiling.
+
+A ``RequestProfile`` is bound to the current context for profiled requests
+only. Code on the analysis path wraps its stages in ``stage(name)``, which
+returns a shared no-op context manager when no profile is bound, so
+unprofiled requests pay a single context variable lookup per stage.
+
+Profiles can also sample the stack of the thread doing the work; the
+samples are reported as collapsed stacks for requests slower than a
+threshold.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import AbstractContextManager, nullcontext
+from contextvars import ContextVar, Token
+from types import TracebackType
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar("current_profile", default=None)
+_DISABLED = nullcontext()
+
+
+class _StackSampler(threading.Thread):
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="request-profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+class RequestProfile:
+    """Stage timings, and optionally stack samples, for one request."""
+
+    def __init__(self, sample_interval_ms: float | None = None) -> None:
+        self.started = time.perf_counter()
+        self.stages: list[tuple[str, float]] = []
+        self._sample_interval_ms = sample_interval_ms
+        self._sampler: _StackSampler | None = None
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ms: float) -> None:
+        """Record a stage duration."""
+        with self._lock:
+            self.stages.append((name, duration_ms))
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the profile started."""
+        return (time.perf_counter() - self.started) * 1000
+
+    def _ensure_sampler(self) -> None:
+        # The sampler follows the first thread that runs a stage, which is the
+        # worker thread for synchronous routes.
+        if self._sample_interval_ms is None or self._sampler is not None:
+            return
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = _StackSampler(
+                    threading.get_ident(), self._sample_interval_ms / 1000
+                )
+                self._sampler.start()
+
+    def finish(self) -> Counter[str]:
+        """Stop stack sampling.
+
+        Returns:
+            Sample counts per collapsed stack (empty when sampling is off)
+        """
+        if self._sampler is None:
+            return Counter()
+        self._sampler.stop()
+        return self._sampler.samples
+
+    def server_timing(self) -> str:
+        """Format the stage timings as a ``Server-Timing`` header value."""
+        metrics = [f"{name};dur={duration:.3f}" for name, duration in self.stages]
+        metrics.append(f"total;dur={self.elapsed_ms():.3f}")
+        return ", ".join(metrics)
+
+
+class _Stage:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile: RequestProfile, name: str) -> None:
+        self.profile = profile
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.profile._ensure_sampler()
+        self.started = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.profile.record(self.name, (time.perf_counter() - self.started) * 1000)
+
+
+def stage(name: str) -> AbstractContextManager[None]:
+    """Time a block as a named stage of the current request, if it is profiled."""
+    profile = _current_profile.get()
+    if profile is None:
+        return _DISABLED
+    return _Stage(profile, name)
+
+
+def start_profile(profile: RequestProfile) -> Token["RequestProfile | None"]:
+    """Bind a profile to the current context."""
+    return _current_profile.set(profile)
+
+
+def stop_profile(token: Token["RequestProfile | None"]) -> None:
+    """Unbind the profile bound by ``start_profile``."""
+    _current_profile.reset(token)
+
+
+def format_samples(samples: Counter[str], limit: int = 10) -> str:
+    """Format the most frequent collapsed stacks, one per line."""
+    return "\n".join(f"{count} {stack}" for stack, count in samples.most_common(limit))
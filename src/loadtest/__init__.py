@@ -0,0 +1,5 @@
+"""Local load testing against a fake UCI engine."""
+
+from .harness import SLO, FakeEngineConfig, LoadTestConfig, LoadTestReport, run_load_test
+
+__all__ = ["SLO", "FakeEngineConfig", "LoadTestConfig", "LoadTestReport", "run_load_test"]
@@ -0,0 +1,74 @@
+"""Command-line entrypoint: ``python -m src.loadtest``."""
+
+import argparse
+import sys
+
+from .harness import SLO, FakeEngineConfig, LoadTestConfig, run_load_test
+
+
+def main() -> int:
+    """Run a load test and print its report.
+
+    Returns:
+        Exit code, non-zero when an SLO is violated
+    """
+    parser = argparse.ArgumentParser(description="Load test the API against a fake engine")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of traffic")
+    parser.add_argument("--mix", default="move=0.6,game=0.3,stream=0.1")
+    parser.add_argument("--game-plies", type=int, default=16)
+    parser.add_argument(
+        "--corpus-games", type=int, default=None, help="Replay a fixed set of games"
+    )
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds first")
+    parser.add_argument("--think-time-ms", type=float, default=0.0)
+    parser.add_argument("--profile", default=None, help="Engine profile for every request")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=2.0)
+    parser.add_argument("--score-mean", type=float, default=20.0)
+    parser.add_argument("--score-stddev", type=float, default=80.0)
+    parser.add_argument("--mate-probability", type=float, default=0.0)
+    parser.add_argument("--slo-p95-ms", type=float, default=500.0)
+    parser.add_argument("--slo-p99-ms", type=float, default=1000.0)
+    parser.add_argument("--slo-max-error-rate", type=float, default=0.01)
+    parser.add_argument("--slo-min-throughput", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mix = {}
+    for item in args.mix.split(","):
+        scenario, _, weight = item.partition("=")
+        mix[scenario.strip()] = float(weight)
+
+    config = LoadTestConfig(
+        concurrency=args.concurrency,
+        duration_seconds=args.duration,
+        mix=mix,
+        game_plies=args.game_plies,
+        corpus_games=args.corpus_games,
+        warmup_seconds=args.warmup,
+        think_time_ms=args.think_time_ms,
+        profile=args.profile,
+        seed=args.seed,
+        engine=FakeEngineConfig(
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            score_mean=args.score_mean,
+            score_stddev=args.score_stddev,
+            mate_probability=args.mate_probability,
+            seed=args.seed,
+        ),
+        slo=SLO(
+            p95_ms=args.slo_p95_ms,
+            p99_ms=args.slo_p99_ms,
+            max_error_rate=args.slo_max_error_rate,
+            min_throughput=args.slo_min_throughput,
+        ),
+    )
+    report = run_load_test(config)
+    print(report.model_dump_json(indent=2))
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Scripted UCI engine for load tests.
+
+Speaks enough UCI for the ``stockfish`` wrapper (``uci``, ``isready``,
+``setoption``, ``position``, ``d``, ``go`` and ``stop``) and answers searches
+after a configurable latency with scores drawn from a configurable
+distribution. Scores are seeded by position, so repeated runs are
+reproducible. The module only depends on python-chess so it can run as a
+standalone script.
+"""
+
+import argparse
+import random
+import sys
+import threading
+import zlib
+
+import chess
+
+
+class FakeEngine:
+    """UCI command loop with synthetic search results."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.board = chess.Board()
+        self.multipv = 1
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.search: threading.Thread | None = None
+
+    def send(self, line: str) -> None:
+        with self.lock:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+    def run(self) -> None:
+        self.send("Stockfish 16 by the load test harness")
+        for raw in sys.stdin:
+            line = raw.strip()
+            if not line:
+                continue
+            command, _, rest = line.partition(" ")
+            if command == "quit":
+                break
+            if command != "stop":
+                self.wait_for_search()
+            handler = getattr(self, f"cmd_{command}", None)
+            if handler is not None:
+                handler(rest)
+        self.stop_event.set()
+
+    def wait_for_search(self) -> None:
+        if self.search is not None:
+            self.search.join()
+            self.search = None
+
+    def cmd_uci(self, _: str) -> None:
+        self.send("id name Stockfish 16")
+        self.send("option name MultiPV type spin default 1 min 1 max 500")
+        self.send("uciok")
+
+    def cmd_isready(self, _: str) -> None:
+        self.send("readyok")
+
+    def cmd_setoption(self, rest: str) -> None:
+        name, _, value = rest.removeprefix("name ").partition(" value ")
+        if name == "MultiPV":
+            self.multipv = int(value)
+
+    def cmd_ucinewgame(self, _: str) -> None:
+        self.board = chess.Board()
+
+    def cmd_position(self, rest: str) -> None:
+        tokens = rest.split()
+        if not tokens or tokens[0] not in ("startpos", "fen"):
+            return
+        moves_at = tokens.index("moves") if "moves" in tokens else len(tokens)
+        try:
+            board = (
+                chess.Board()
+                if tokens[0] == "startpos"
+                else chess.Board(" ".join(tokens[1:moves_at]))
+            )
+            for move in tokens[moves_at + 1 :]:
+                board.push_uci(move)
+        except ValueError:
+            return
+        self.board = board
+
+    def cmd_d(self, _: str) -> None:
+        self.send(str(self.board))
+        self.send(f"Fen: {self.board.fen()}")
+        checkers = " ".join(chess.square_name(square) for square in self.board.checkers())
+        self.send(f"Checkers: {checkers}")
+
+    def cmd_stop(self, _: str) -> None:
+        self.stop_event.set()
+
+    def cmd_go(self, rest: str) -> None:
+        tokens = rest.split()
+        depth = int(tokens[tokens.index("depth") + 1]) if "depth" in tokens else 20
+        # A movetime search takes its full budget unless stopped.
+        movetime = int(tokens[tokens.index("movetime") + 1]) if "movetime" in tokens else None
+        moves = list(self.board.legal_moves)
+        if "searchmoves" in tokens:
+            wanted = set(tokens[tokens.index("searchmoves") + 1 :])
+            moves = [move for move in moves if move.uci() in wanted]
+        self.stop_event = threading.Event()
+        self.search = threading.Thread(
+            target=self.respond,
+            args=(self.board.copy(), moves, depth, movetime, self.stop_event),
+        )
+        self.search.start()
+
+    def respond(
+        self,
+        board: chess.Board,
+        moves: list[chess.Move],
+        depth: int,
+        movetime: int | None,
+        stop: threading.Event,
+    ) -> None:
+        rng = random.Random(zlib.crc32(board.fen().encode()) ^ self.args.seed)
+        latency = max(0.0, rng.gauss(self.args.latency_ms, self.args.latency_jitter_ms))
+        if movetime is not None:
+            latency = movetime
+        stop.wait(latency / 1000)
+
+        if not moves:
+            score = "mate 0" if board.is_check() else "cp 0"
+            self.send(f"info depth 0 score {score}")
+            self.send("bestmove (none)")
+            return
+
+        rng.shuffle(moves)
+        lines = moves[: self.multipv]
+        # UCI scores are relative to the side to move; the configured mean is white-relative.
+        sign = 1 if board.turn == chess.WHITE else -1
+        centipawns = sign * rng.gauss(self.args.score_mean, self.args.score_stddev)
+        for rank, move in enumerate(lines, start=1):
+            if rank > 1:
+                # Each line scores below the one before it, as in a real MultiPV search.
+                centipawns -= abs(rng.gauss(0, self.args.score_stddev))
+            if rank == 1 and rng.random() < self.args.mate_probability:
+                score = f"mate {rng.randint(1, 5)}"
+            else:
+                score = f"cp {int(centipawns)}"
+            self.send(
+                f"info depth {depth} seldepth {depth} multipv {rank} score {score} "
+                f"nodes 1000 nps 100000 time 10 pv {move.uci()}"
+            )
+        self.send(f"bestmove {lines[0].uci()}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--score-mean", type=float, default=20.0)
+    parser.add_argument("--score-stddev", type=float, default=80.0)
+    parser.add_argument("--mate-probability", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    FakeEngine(parse_args()).run()
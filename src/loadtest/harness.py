@@ -0,0 +1,325 @@
+"""Load-test harness driving the API against a fake UCI engine.
+
+The app is built with ``create_app()`` and served by uvicorn on a local
+port, with every engine path pointed at a generated wrapper script around
+``fake_engine.py``. Concurrent workers then replay a weighted mix of
+traffic and the harness reports throughput, latency percentiles and error
+rates against the configured SLOs.
+"""
+
+import asyncio
+import math
+import random
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import time
+import typing
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import chess
+import httpx
+import uvicorn
+from pydantic import BaseModel, Field
+
+from src.api.main import create_app
+from src.chess.cache import evaluation_cache
+from src.chess.engine import engine_pool
+from src.core import settings
+
+FAKE_ENGINE = Path(__file__).with_name("fake_engine.py")
+
+Scenario = typing.Literal["move", "game", "stream"]
+
+
+class FakeEngineConfig(BaseModel):
+    """Latency and score distribution of the fake engine."""
+
+    latency_ms: float = Field(default=5.0, ge=0, description="Mean search latency")
+    latency_jitter_ms: float = Field(default=2.0, ge=0, description="Search latency stddev")
+    score_mean: float = Field(default=20.0, description="Mean white-relative score (cp)")
+    score_stddev: float = Field(default=80.0, ge=0, description="Score stddev (cp)")
+    mate_probability: float = Field(default=0.0, ge=0, le=1, description="Chance of a mate score")
+    seed: int = 0
+
+
+class SLO(BaseModel):
+    """Service level objectives a run is checked against."""
+
+    p95_ms: float = 500.0
+    p99_ms: float = 1000.0
+    max_error_rate: float = 0.01
+    min_throughput: float = 0.0
+
+
+class LoadTestConfig(BaseModel):
+    """Traffic shape of a load test run."""
+
+    concurrency: int = Field(default=8, ge=1)
+    duration_seconds: float = Field(default=10.0, gt=0)
+    mix: dict[Scenario, float] = Field(
+        default={"move": 0.6, "game": 0.3, "stream": 0.1},
+        description="Relative weight of each traffic scenario",
+    )
+    game_plies: int = Field(default=16, ge=1, description="Moves per game and stream")
+    corpus_games: int | None = Field(
+        default=None,
+        ge=1,
+        description="Games traffic is drawn from; None plays a new game every iteration",
+    )
+    warmup_seconds: float = Field(
+        default=2.0, ge=0, description="Unmeasured traffic that spawns the pooled engines first"
+    )
+    think_time_ms: float = Field(default=0.0, ge=0, description="Pause between stream moves")
+    profile: str | None = None
+    seed: int = 0
+    engine: FakeEngineConfig = Field(default_factory=FakeEngineConfig)
+    slo: SLO = Field(default_factory=SLO)
+
+
+class LatencyStats(BaseModel):
+    """Request latency summary."""
+
+    requests: int
+    errors: int
+    error_rate: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class LoadTestReport(BaseModel):
+    """Results of a load test run."""
+
+    duration_seconds: float
+    throughput: float
+    cache_hit_ratio: float = Field(default=0.0, description="Evaluation cache hits per lookup")
+    overall: LatencyStats
+    scenarios: dict[str, LatencyStats]
+    slo_violations: list[str]
+
+    @property
+    def passed(self) -> bool:
+        """Whether every SLO was met."""
+        return not self.slo_violations
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: list[tuple[float, bool]]) -> LatencyStats:
+    """Summarize ``(latency_ms, ok)`` samples."""
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    return LatencyStats(
+        requests=len(samples),
+        errors=errors,
+        error_rate=errors / len(samples) if samples else 0.0,
+        p50_ms=percentile(latencies, 50),
+        p95_ms=percentile(latencies, 95),
+        p99_ms=percentile(latencies, 99),
+        max_ms=latencies[-1] if latencies else 0.0,
+    )
+
+
+def check_slo(report: LoadTestReport, slo: SLO) -> list[str]:
+    """List the SLOs a report violates."""
+    overall = report.overall
+    violations = []
+    if overall.p95_ms > slo.p95_ms:
+        violations.append(f"p95 {overall.p95_ms:.1f}ms > {slo.p95_ms:.1f}ms")
+    if overall.p99_ms > slo.p99_ms:
+        violations.append(f"p99 {overall.p99_ms:.1f}ms > {slo.p99_ms:.1f}ms")
+    if overall.error_rate > slo.max_error_rate:
+        violations.append(f"error rate {overall.error_rate:.2%} > {slo.max_error_rate:.2%}")
+    if report.throughput < slo.min_throughput:
+        violations.append(f"throughput {report.throughput:.1f}/s < {slo.min_throughput:.1f}/s")
+    return violations
+
+
+def write_engine_script(config: FakeEngineConfig, directory: Path) -> Path:
+    """Write an executable wrapper that starts the fake engine with ``config``."""
+    script = directory / "fake-stockfish"
+    script.write_text(
+        "#!/bin/sh\n"
+        f'exec "{sys.executable}" "{FAKE_ENGINE}" '
+        f"--latency-ms {config.latency_ms} --latency-jitter-ms {config.latency_jitter_ms} "
+        f"--score-mean {config.score_mean} --score-stddev {config.score_stddev} "
+        f"--mate-probability {config.mate_probability} --seed {config.seed}\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    return script
+
+
+def random_games(count: int, plies: int, seed: int) -> list[list[tuple[str, str]]]:
+    """Generate reproducible games as ``(fen_before, move_uci)`` pairs."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        board = chess.Board()
+        game = []
+        while len(game) < plies and not board.is_game_over():
+            move = rng.choice(list(board.legal_moves))
+            game.append((board.fen(), move.uci()))
+            board.push(move)
+        games.append(game)
+    return games
+
+
+@contextmanager
+def serve(engine: FakeEngineConfig) -> Iterator[str]:
+    """Serve ``create_app()`` locally with every engine replaced by the fake one.
+
+    Yields:
+        Base URL of the running app
+    """
+    original_path = engine_pool.path
+    with tempfile.TemporaryDirectory() as directory:
+        script = str(write_engine_script(engine, Path(directory)))
+        settings.stockfish_path = engine_pool.path = script
+        engine_pool.clear()
+        evaluation_cache.clear()
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        server = uvicorn.Server(
+            uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="warning")
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        try:
+            while not server.started:
+                if not thread.is_alive():
+                    raise RuntimeError("Load test server failed to start")
+                time.sleep(0.01)
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            server.should_exit = True
+            thread.join()
+            engine_pool.clear()
+            settings.stockfish_path = engine_pool.path = original_path
+
+
+class _Traffic:
+    def __init__(self, client: httpx.AsyncClient, config: LoadTestConfig) -> None:
+        self.client = client
+        self.config = config
+        self.games = (
+            None
+            if config.corpus_games is None
+            else random_games(config.corpus_games, config.game_plies, config.seed)
+        )
+        self.measure_from = 0.0
+        self.samples: dict[str, list[tuple[float, bool]]] = defaultdict(list)
+
+    def pick_game(self, rng: random.Random) -> list[tuple[str, str]]:
+        if self.games is None:
+            return random_games(1, self.config.game_plies, rng.getrandbits(32))[0]
+        return rng.choice(self.games)
+
+    async def request(
+        self, scenario: str, method: str, url: str, **kwargs: typing.Any
+    ) -> httpx.Response | None:
+        measured = time.monotonic() >= self.measure_from
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        ok = response is not None and response.is_success
+        if measured:
+            self.samples[scenario].append(((time.perf_counter() - started) * 1000, ok))
+        return response if ok else None
+
+    async def move(self, rng: random.Random) -> None:
+        fen, move = rng.choice(self.pick_game(rng))
+        await self.request("move", "POST", "/analysis/move", json=self._move(fen, move))
+
+    async def game(self, rng: random.Random) -> None:
+        for fen, move in self.pick_game(rng):
+            await self.request("game", "POST", "/analysis/move", json=self._move(fen, move))
+
+    async def stream(self, rng: random.Random) -> None:
+        response = await self.request(
+            "stream", "POST", "/sessions", json={"profile": self.config.profile}
+        )
+        if response is None:
+            return
+        session_id = response.json()["session_id"]
+        for _, move in self.pick_game(rng):
+            await asyncio.sleep(self.config.think_time_ms / 1000)
+            await self.request(
+                "stream", "POST", f"/sessions/{session_id}/moves", json={"move_uci": move}
+            )
+        await self.request("stream", "DELETE", f"/sessions/{session_id}")
+
+    def _move(self, fen: str, move: str) -> dict[str, typing.Any]:
+        return {"fen_before": fen, "move_uci": move, "profile": self.config.profile}
+
+    async def worker(self, index: int, deadline: float) -> None:
+        rng = random.Random(self.config.seed * 1000 + index)
+        scenarios = list(self.config.mix)
+        weights = [self.config.mix[scenario] for scenario in scenarios]
+        while time.monotonic() < deadline:
+            scenario = rng.choices(scenarios, weights)[0]
+            await getattr(self, scenario)(rng)
+
+
+async def drive(base_url: str, config: LoadTestConfig) -> LoadTestReport:
+    """Replay the configured traffic mix against a running app.
+
+    Requests sent during the warmup are not measured.
+    """
+    limits = httpx.Limits(max_connections=config.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        traffic = _Traffic(client, config)
+        traffic.measure_from = time.monotonic() + config.warmup_seconds
+        deadline = traffic.measure_from + config.duration_seconds
+
+        async def measure_cache() -> tuple[int, int]:
+            await asyncio.sleep(config.warmup_seconds)
+            return evaluation_cache.hits, evaluation_cache.misses
+
+        cache_task = asyncio.create_task(measure_cache())
+        await asyncio.gather(*(traffic.worker(i, deadline) for i in range(config.concurrency)))
+        elapsed = time.monotonic() - traffic.measure_from
+        hits, misses = await cache_task
+
+    hits = evaluation_cache.hits - hits
+    lookups = hits + evaluation_cache.misses - misses
+    all_samples = [sample for samples in traffic.samples.values() for sample in samples]
+    report = LoadTestReport(
+        duration_seconds=elapsed,
+        throughput=len(all_samples) / elapsed,
+        cache_hit_ratio=hits / lookups if lookups else 0.0,
+        overall=summarize(all_samples),
+        scenarios={name: summarize(samples) for name, samples in traffic.samples.items()},
+        slo_violations=[],
+    )
+    report.slo_violations = check_slo(report, config.slo)
+    return report
+
+
+def run_load_test(config: LoadTestConfig) -> LoadTestReport:
+    """Start the app against the fake engine and run a load test.
+
+    Args:
+        config: Traffic, engine and SLO configuration
+
+    Returns:
+        Throughput, latency and error report with any SLO violations
+    """
+    with serve(config.engine) as base_url:
+        return asyncio.run(drive(base_url, config))
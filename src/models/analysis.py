@@ -0,0 +1,34 @@
+"""Schemas for move analysis requests and results."""
+
+import typing
+
+from pydantic import BaseModel, Field
+
+from src.classification.move_quality import MoveQuality
+
+
+class Evaluation(BaseModel):
+    """A White-relative engine evaluation."""
+
+    type: typing.Literal["cp", "mate"] = Field(description="Centipawn score or mate distance")
+    value: int = Field(description="Centipawns, or moves to mate (negative when Black mates)")
+
+
+class MoveAnalysisRequest(BaseModel):
+    """A single move to analyse."""
+
+    fen_before: str = Field(description="Position before the move, in FEN")
+    move_uci: str = Field(description="Move played, in UCI notation")
+    profile: str | None = Field(
+        default=None,
+        description="Engine profile name; the configured default is used when omitted",
+    )
+
+
+class MoveAnalysis(BaseModel):
+    """Post-move analysis with its quality verdict."""
+
+    before: dict[str, typing.Any]
+    after: dict[str, typing.Any]
+    delta: int | None
+    quality: MoveQuality
@@ -0,0 +1,89 @@
+"""Schemas for analysed games and aggregated player profiles."""
+
+import typing
+
+import chess
+from pydantic import BaseModel, Field, computed_field, field_validator
+
+from src.models.analysis import Evaluation
+
+
+class AnalysedMove(BaseModel):
+    """A single move together with its post-move analysis."""
+
+    fen_before: str = Field(description="Position before the move, in FEN")
+    move_uci: str = Field(description="Move played, in UCI notation")
+    before: Evaluation = Field(description="Evaluation before the move")
+    after: Evaluation = Field(description="Evaluation after the move")
+    delta: int | None = Field(default=None, description="Mover-relative centipawn delta")
+    clock_seconds: float | None = Field(
+        default=None,
+        description="Mover's remaining clock time when the move was played",
+    )
+
+    @field_validator("fen_before")
+    @classmethod
+    def check_fen(cls, fen: str) -> str:
+        """Require a complete, parseable FEN."""
+        if len(fen.split()) != 6:
+            raise ValueError("FEN must have 6 fields")
+        chess.Board(fen)
+        return fen
+
+    @field_validator("move_uci")
+    @classmethod
+    def check_move(cls, move_uci: str) -> str:
+        """Require UCI move syntax."""
+        chess.Move.from_uci(move_uci)
+        return move_uci
+
+
+class AnalysedGame(BaseModel):
+    """An analysed game submitted for a single player."""
+
+    game_id: str = Field(description="Unique game identifier, used to ignore resubmissions")
+    color: typing.Literal["w", "b"] = Field(description="Side played by the player")
+    opening: str = Field(default="unknown", description="Opening name or ECO code")
+    moves: list[AnalysedMove] = Field(default_factory=list)
+
+
+class BucketStats(BaseModel):
+    """Move quality counters for one aggregation bucket."""
+
+    moves: int = 0
+    best: int = 0
+    good: int = 0
+    inaccuracy: int = 0
+    mistake: int = 0
+    blunder: int = 0
+    cp_moves: int = 0
+    cp_loss: int = 0
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def acpl(self) -> float | None:
+        """Average centipawn loss over moves with a centipawn delta."""
+        return self.cp_loss / self.cp_moves if self.cp_moves else None
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def blunder_rate(self) -> float:
+        """Fraction of moves classified as blunders."""
+        return self.blunder / self.moves if self.moves else 0.0
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def mistake_rate(self) -> float:
+        """Fraction of moves classified as mistakes or blunders."""
+        return (self.mistake + self.blunder) / self.moves if self.moves else 0.0
+
+
+class PlayerProfile(BaseModel):
+    """Precomputed per-player weaknesses."""
+
+    player_id: str
+    games: int = 0
+    overall: BucketStats = Field(default_factory=BucketStats)
+    phases: dict[str, BucketStats] = Field(default_factory=dict)
+    openings: dict[str, BucketStats] = Field(default_factory=dict)
+    time_pressure: BucketStats = Field(default_factory=BucketStats)
@@ -0,0 +1,28 @@
+"""Schemas for training puzzles mined from analysed games."""
+
+from pydantic import BaseModel, Field
+
+from src.classification.move_quality import MoveQuality
+
+
+class Puzzle(BaseModel):
+    """A position where the player missed a uniquely best move."""
+
+    position: str = Field(description="Normalized position (EPD) used for deduplication")
+    fen: str = Field(description="Position to solve, in FEN")
+    solution: str = Field(description="Uniquely best move, in UCI notation")
+    played_move: str = Field(description="Move the player actually chose")
+    quality: MoveQuality = Field(description="Quality of the played move")
+    gap_cp: int = Field(description="Score gap between the solution and the second best move")
+    player_id: str | None = None
+
+
+class MiningStats(BaseModel):
+    """Counters reported by a puzzle mining run."""
+
+    moves: int = 0
+    candidates: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    invalid: int = 0
+    stored: int = 0
@@ -0,0 +1,31 @@
+"""Schemas for live game sessions."""
+
+from pydantic import BaseModel, Field
+
+
+class SessionCreateRequest(BaseModel):
+    """Options for opening a live game session."""
+
+    fen: str | None = Field(
+        default=None,
+        description="Start position in FEN; the standard initial position when omitted",
+    )
+    profile: str | None = Field(
+        default=None,
+        description="Engine profile name; the configured default is used when omitted",
+    )
+
+
+class SessionMoveRequest(BaseModel):
+    """A move played in a live session."""
+
+    move_uci: str = Field(description="Move played, in UCI notation")
+
+
+class SessionState(BaseModel):
+    """Current state of a live session."""
+
+    session_id: str
+    profile: str
+    fen: str
+    moves: list[str]
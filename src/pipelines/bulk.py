@@ -0,0 +1,237 @@
+"""MessagePack bulk analysis protocol.
+
+A request is a single MessagePack map:
+
+    profile    engine profile name, or nil for the default profile
+    positions  array of packed FEN positions (bin, see ``src.chess.packing``)
+               or plain FEN strings, which cost more bandwidth but
+               nothing to decode
+    moves      bin, one little-endian uint16 move code per position,
+               see ``src.chess.opening_book.encode_move``
+
+The response is a stream of MessagePack maps, one per chunk of rows, with
+the results packed into little-endian columns:
+
+    offset                   index of the chunk's first row
+    count                    rows in the chunk
+    before_type, after_type  bin, uint8 per row: 0 centipawns, 1 mate
+    before, after            bin, int32 evaluation value per row
+    delta                    bin, int32 per row, INT32_MIN when undefined
+    quality                  bin, uint8 per row: index into MoveQuality,
+                             255 for rows that failed
+    errors                   map of row index to error message
+
+Rows are analysed exactly as ``POST /analysis/move`` would analyse them.
+"""
+
+import struct
+import typing
+from collections.abc import Iterable, Iterator
+
+import chess
+import msgpack
+from stockfish import StockfishException
+
+from src.chess.engine import engine_pool
+from src.chess.opening_book import decode_move, encode_move
+from src.chess.packing import pack_fen, unpack_fen
+from src.classification.move_quality import MoveQuality, classify_move
+from src.core import get_logger, settings
+from src.models.analysis import MoveAnalysis
+from src.pipelines.post_move import analyze_post_move, get_side_to_move
+
+logger = get_logger(__name__)
+
+MEDIA_TYPE = "application/msgpack"
+
+NO_DELTA = -(2**31)
+FAILED = 255
+
+_EVAL_TYPES = ["cp", "mate"]
+_QUALITIES = list(MoveQuality)
+_PROMOTIONS = (0, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
+
+
+class BulkRequest(typing.NamedTuple):
+    """A decoded bulk analysis request."""
+
+    profile: str
+    fens: list[str]
+    moves: list[str]
+
+
+class BulkResult(typing.NamedTuple):
+    """One row of a decoded bulk analysis response."""
+
+    index: int
+    analysis: MoveAnalysis | None
+    error: str | None
+
+
+def encode_bulk_request(
+    moves: Iterable[tuple[str, str]], profile: str | None = None, pack_positions: bool = True
+) -> bytes:
+    """Encode ``(fen_before, move_uci)`` pairs as a bulk analysis request.
+
+    Args:
+        moves: Positions and the moves played from them
+        profile: Engine profile name, or None for the default profile
+        pack_positions: Send packed positions rather than FEN strings
+
+    Returns:
+        MessagePack request body
+
+    Raises:
+        ValueError: If a FEN or move cannot be encoded
+    """
+    positions: list[bytes | str] = []
+    codes = []
+    for fen, move_uci in moves:
+        positions.append(pack_fen(fen) if pack_positions else fen)
+        codes.append(encode_move(chess.Move.from_uci(move_uci)))
+    payload = {
+        "profile": profile,
+        "positions": positions,
+        "moves": struct.pack(f"<{len(codes)}H", *codes),
+    }
+    return typing.cast(bytes, msgpack.packb(payload, use_bin_type=True))
+
+
+def decode_bulk_request(body: bytes) -> BulkRequest:
+    """Decode and validate a bulk analysis request.
+
+    Raises:
+        ValueError: If the body is malformed or names an unknown profile
+    """
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except (msgpack.UnpackException, ValueError) as exc:
+        raise ValueError(f"Invalid MessagePack body: {exc}") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("Bulk request must be a map")
+
+    positions = payload.get("positions")
+    move_codes = payload.get("moves")
+    if not isinstance(positions, list) or not isinstance(move_codes, bytes):
+        raise ValueError("Bulk request needs a positions array and a moves bin")
+    if len(move_codes) != 2 * len(positions):
+        raise ValueError("Expected one move per position")
+
+    fens = []
+    for index, packed in enumerate(positions):
+        if isinstance(packed, str):
+            fens.append(packed)
+            continue
+        if not isinstance(packed, bytes):
+            raise ValueError(f"Position {index} is neither a bin nor a FEN string")
+        try:
+            fens.append(unpack_fen(packed))
+        except ValueError as exc:
+            raise ValueError(f"Position {index}: {exc}") from exc
+
+    moves = []
+    for index, (code,) in enumerate(struct.iter_unpack("<H", move_codes)):
+        if code >> 15 or code >> 12 not in _PROMOTIONS:
+            raise ValueError(f"Move {index}: invalid move code {code}")
+        moves.append(decode_move(code).uci())
+
+    return BulkRequest(engine_pool.resolve(payload.get("profile")), fens, moves)
+
+
+def _pack_chunk(offset: int, rows: list[tuple[dict[str, typing.Any], MoveQuality] | str]) -> bytes:
+    count = len(rows)
+    columns: dict[str, list[int]] = {
+        name: [] for name in ("before_type", "before", "after_type", "after", "delta", "quality")
+    }
+    errors: dict[int, str] = {}
+    for index, row in enumerate(rows):
+        if isinstance(row, str):
+            errors[offset + index] = row
+            for name, column in columns.items():
+                column.append(FAILED if name == "quality" else 0)
+            continue
+        analysis, quality = row
+        for side in ("before", "after"):
+            columns[f"{side}_type"].append(_EVAL_TYPES.index(analysis[side]["type"]))
+            columns[side].append(analysis[side]["value"])
+        columns["delta"].append(NO_DELTA if analysis["delta"] is None else analysis["delta"])
+        columns["quality"].append(_QUALITIES.index(quality))
+
+    chunk = {
+        "offset": offset,
+        "count": count,
+        "before_type": bytes(columns["before_type"]),
+        "before": struct.pack(f"<{count}i", *columns["before"]),
+        "after_type": bytes(columns["after_type"]),
+        "after": struct.pack(f"<{count}i", *columns["after"]),
+        "delta": struct.pack(f"<{count}i", *columns["delta"]),
+        "quality": bytes(columns["quality"]),
+        "errors": errors,
+    }
+    return typing.cast(bytes, msgpack.packb(chunk, use_bin_type=True))
+
+
+def analyze_bulk(request: BulkRequest, chunk_size: int | None = None) -> Iterator[bytes]:
+    """Analyse a bulk request, yielding encoded response chunks.
+
+    Rows whose analysis fails validation, or whose engine fails, are
+    reported in the chunk's errors instead of failing the whole request.
+
+    Args:
+        request: Decoded bulk request
+        chunk_size: Rows per response chunk, defaulting to settings
+
+    Yields:
+        MessagePack-encoded response chunks
+    """
+    chunk_size = chunk_size or settings.bulk_chunk_size
+    for offset in range(0, len(request.fens), chunk_size):
+        rows: list[tuple[dict[str, typing.Any], MoveQuality] | str] = []
+        for fen, move_uci in zip(
+            request.fens[offset : offset + chunk_size],
+            request.moves[offset : offset + chunk_size],
+            strict=True,
+        ):
+            try:
+                analysis = analyze_post_move(fen, move_uci, request.profile)
+            except ValueError as exc:
+                rows.append(str(exc))
+                continue
+            except (StockfishException, BrokenPipeError) as exc:
+                logger.warning(f"Bulk analysis of {fen} {move_uci} failed: {exc}")
+                rows.append("Engine failure")
+                continue
+            side_to_move = typing.cast(typing.Literal["w", "b"], get_side_to_move(fen))
+            rows.append((analysis, classify_move(analysis, side_to_move)))
+        yield _pack_chunk(offset, rows)
+
+
+def decode_bulk_response(chunks: Iterable[bytes]) -> Iterator[BulkResult]:
+    """Decode a streamed bulk analysis response.
+
+    Args:
+        chunks: Response body in arbitrarily split pieces
+
+    Yields:
+        One result per analysed row, in request order
+    """
+    unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+    for data in chunks:
+        unpacker.feed(data)
+        for chunk in unpacker:
+            count = chunk["count"]
+            before = struct.unpack(f"<{count}i", chunk["before"])
+            after = struct.unpack(f"<{count}i", chunk["after"])
+            delta = struct.unpack(f"<{count}i", chunk["delta"])
+            for row in range(count):
+                index = chunk["offset"] + row
+                if chunk["quality"][row] == FAILED:
+                    yield BulkResult(index, None, chunk["errors"][index])
+                    continue
+                analysis = MoveAnalysis(
+                    before={"type": _EVAL_TYPES[chunk["before_type"][row]], "value": before[row]},
+                    after={"type": _EVAL_TYPES[chunk["after_type"][row]], "value": after[row]},
+                    delta=None if delta[row] == NO_DELTA else delta[row],
+                    quality=_QUALITIES[chunk["quality"][row]],
+                )
+                yield BulkResult(index, analysis, None)
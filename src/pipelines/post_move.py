@@ -1,6 +1,11 @@
 import typing
 
-from stockfish import Stockfish
+import chess
+
+from src.chess.cache import evaluation_cache
+from src.chess.engine import engine_pool
+from src.chess.opening_book import get_opening_book
+from src.core.profiling import stage
 
 
 def get_side_to_move(fen: str) -> str:
@@ -8,6 +13,18 @@ def get_side_to_move(fen: str) -> str:
     return fen_splitted[1]
 
 
+def is_valid_fen(fen: str) -> bool:
+    """Check a FEN with python-chess.
+
+    ``Stockfish.is_fen_valid`` starts a throwaway engine process per call,
+    which would cost more than the analysis itself.
+    """
+    try:
+        return chess.Board(fen).is_valid()
+    except ValueError:
+        return False
+
+
 def calculate_delta(
     eval_before: dict[str, typing.Any], eval_after: dict[str, typing.Any], side_to_move: str
 ) -> int | None:
@@ -19,31 +36,78 @@ def calculate_delta(
         return None
 
 
-# TODO: inject engine instance (avoid reinitialization per call)
-def analyze_post_move(fen_before: str, move_uci: str) -> dict[str, typing.Any]:
+def analyze_from_book(fen_before: str, move_uci: str) -> dict[str, typing.Any] | None:
+    """Post-move analysis from the opening book, without an engine search.
+
+    Returns:
+        before, after and delta, or None if there is no book, the move is
+        illegal or the book has no verdict
+    """
+    book = get_opening_book()
+    if book is None:
+        return None
+    try:
+        board = chess.Board(fen_before)
+        move = chess.Move.from_uci(move_uci)
+    except ValueError:
+        # Let the engine path report invalid input.
+        return None
+    if move not in board.legal_moves:
+        return None
+    evaluations = book.evaluations(board, move)
+    if evaluations is None:
+        return None
+    evaluation_before, evaluation_after = evaluations
+    delta = calculate_delta(evaluation_before, evaluation_after, get_side_to_move(fen_before))
+    return {"before": evaluation_before, "after": evaluation_after, "delta": delta}
+
+
+def analyze_post_move(
+    fen_before: str, move_uci: str, profile: str | None = None
+) -> dict[str, typing.Any]:
     """
     Post-move deterministic analysis.
     Contract:
-        - Input: fen_before, move_uci
+        - Input: fen_before, move_uci, optional engine profile name
         - Output: before, after, delta
         - Evaluation is mover-relative.
+    Well-known opening positions are answered from the opening book, and
+    other results from the evaluation cache when the same move was already
+    analysed, or speculatively pre-analysed, under the same profile.
     """
 
-    engine = Stockfish("/usr/games/stockfish")
+    profile = engine_pool.resolve(profile)
+    with stage("opening_book"):
+        book_analysis = analyze_from_book(fen_before, move_uci)
+    if book_analysis is not None:
+        return book_analysis
 
-    if not engine.is_fen_valid(fen_before):
-        raise ValueError("Invalid Fen!")
+    with stage("cache"):
+        cached = evaluation_cache.get(profile, fen_before, move_uci)
+    if cached is not None:
+        return cached
 
+    with stage("validate_fen"):
+        if not is_valid_fen(fen_before):
+            raise ValueError("Invalid Fen!")
     side_to_move = get_side_to_move(fen_before)
 
-    engine.set_fen_position(fen_before)
-    evaluation_before = engine.get_evaluation()
-    engine.make_moves_from_current_position([move_uci])
-    evaluation_after = engine.get_evaluation()
+    with engine_pool.checkout(profile) as engine:
+        with stage("set_fen_position"):
+            engine.set_fen_position(fen_before)
+        with stage("search_before"):
+            evaluation_before = engine.get_evaluation()
+        with stage("make_moves"):
+            engine.make_moves_from_current_position([move_uci])
+        with stage("search_after"):
+            evaluation_after = engine.get_evaluation()
 
-    delta = calculate_delta(evaluation_before, evaluation_after, side_to_move)
+    with stage("calculate_delta"):
+        delta = calculate_delta(evaluation_before, evaluation_after, side_to_move)
 
-    return {"before": evaluation_before, "after": evaluation_after, "delta": delta}
+    analysis = {"before": evaluation_before, "after": evaluation_after, "delta": delta}
+    evaluation_cache.put(profile, fen_before, move_uci, analysis)
+    return analysis
 
 
 if __name__ == "__main__":
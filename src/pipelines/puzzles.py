@@ -0,0 +1,226 @@
+"""Puzzle mining from streams of analysed moves.
+
+The stage consumes ``(player_id, AnalysedMove)`` pairs, keeps the player's
+mistakes and blunders, drops positions already in the puzzle store, and
+verifies the rest with a bounded MultiPV search: a candidate becomes a
+puzzle only if one reply is clearly better than every other. Work is done
+in fixed-size batches across a process pool, so memory stays constant no
+matter how large the archive is.
+"""
+
+import json
+import os
+import sys
+import typing
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from multiprocessing import Pool
+
+from pydantic import ValidationError
+from stockfish import StockfishException
+
+from src.chess.engine import ProfiledStockfish
+from src.classification.move_quality import MoveQuality, classify_move
+from src.core import get_logger, settings
+from src.core.config import EngineProfile
+from src.models.profiles import AnalysedMove
+from src.models.puzzles import MiningStats, Puzzle
+from src.pipelines.post_move import get_side_to_move
+from src.puzzles import PuzzleStore, normalize_position
+
+logger = get_logger(__name__)
+
+PlayerMove = tuple[str | None, AnalysedMove]
+Candidate = tuple[str | None, AnalysedMove, MoveQuality, int]
+# Verification outcome: a puzzle, None if rejected, or an error message.
+Verified = Puzzle | None | str
+
+PUZZLE_QUALITIES = (MoveQuality.MISTAKE, MoveQuality.BLUNDER)
+MATE_SCORE = 100_000
+DEFAULT_BATCH_SIZE = 256
+
+# Per-process verification engine, created by the pool initializer.
+_worker_engine: ProfiledStockfish | None = None
+_worker_config: tuple[str, EngineProfile] | None = None
+
+
+def verification_profile() -> EngineProfile:
+    """Engine profile for the bounded verification search."""
+    return EngineProfile(depth=settings.puzzle_verification_depth, multipv=2)
+
+
+def line_score(line: dict[str, typing.Any], side_to_move: str) -> int:
+    """Mover-relative score of a ``get_top_moves`` line, with mates ranked above any cp."""
+    sign = 1 if side_to_move == "w" else -1
+    if line["Mate"] is not None:
+        mate = line["Mate"] * sign
+        return MATE_SCORE - mate if mate > 0 else -MATE_SCORE - mate
+    return int(line["Centipawn"]) * sign
+
+
+def verify_candidate(
+    engine: ProfiledStockfish,
+    player_id: str | None,
+    move: AnalysedMove,
+    quality: MoveQuality,
+    min_gap_cp: int,
+) -> Puzzle | None:
+    """Turn a mistake into a puzzle if its position has a unique best reply.
+
+    Args:
+        engine: Engine configured for the verification search
+        player_id: Player who made the mistake
+        move: The analysed mistake
+        quality: Quality of the played move
+        min_gap_cp: Required gap between the best and second best reply
+
+    Returns:
+        The puzzle, or None if the solution is not unique
+    """
+    engine.set_fen_position(move.fen_before)
+    top_moves = engine.get_top_moves(2)
+    # Forced moves make poor puzzles.
+    if len(top_moves) < 2:
+        return None
+
+    side_to_move = get_side_to_move(move.fen_before)
+    best, second = top_moves
+    gap = line_score(best, side_to_move) - line_score(second, side_to_move)
+    if gap < min_gap_cp or best["Move"] == move.move_uci:
+        return None
+
+    return Puzzle(
+        position=normalize_position(move.fen_before),
+        fen=move.fen_before,
+        solution=best["Move"],
+        played_move=move.move_uci,
+        quality=quality,
+        gap_cp=min(gap, MATE_SCORE),
+        player_id=player_id,
+    )
+
+
+def _init_worker(path: str, profile: EngineProfile) -> None:
+    global _worker_engine, _worker_config
+    _worker_config = (path, profile)
+    _worker_engine = ProfiledStockfish(path, profile)
+
+
+def _verify(engine: ProfiledStockfish, candidate: Candidate) -> Verified:
+    try:
+        return verify_candidate(engine, *candidate)
+    except Exception as exc:
+        # One bad record or engine failure must not end the run.
+        return f"{type(exc).__name__}: {exc}"
+
+
+def _verify_in_worker(candidate: Candidate) -> Verified:
+    global _worker_engine
+    assert _worker_engine is not None and _worker_config is not None
+    try:
+        return verify_candidate(_worker_engine, *candidate)
+    except Exception as exc:
+        if isinstance(exc, StockfishException | BrokenPipeError):
+            # Later candidates in this worker need a working engine.
+            _worker_engine = ProfiledStockfish(*_worker_config)
+        return f"{type(exc).__name__}: {exc}"
+
+
+def _candidates(
+    moves: Iterable[PlayerMove], store: PuzzleStore, stats: MiningStats
+) -> Iterator[Candidate]:
+    for player_id, move in moves:
+        stats.moves += 1
+        try:
+            side_to_move = typing.cast(typing.Literal["w", "b"], get_side_to_move(move.fen_before))
+            quality = classify_move(
+                move.model_dump(include={"before", "after", "delta"}), side_to_move
+            )
+            position = normalize_position(move.fen_before)
+        except (ValueError, IndexError, KeyError, TypeError) as exc:
+            logger.warning(f"Skipping invalid move record: {exc}")
+            stats.invalid += 1
+            continue
+        if quality not in PUZZLE_QUALITIES:
+            continue
+        stats.candidates += 1
+        if store.contains(position):
+            stats.duplicates += 1
+            continue
+        yield player_id, move, quality, settings.puzzle_min_gap_cp
+
+
+def mine_puzzles(
+    moves: Iterable[PlayerMove],
+    store: PuzzleStore,
+    workers: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    engine: ProfiledStockfish | None = None,
+) -> MiningStats:
+    """Mine puzzles from a stream of analysed moves into ``store``.
+
+    Args:
+        moves: ``(player_id, move)`` pairs, consumed lazily
+        store: Puzzle store; also used to skip known positions
+        workers: Verification processes, defaulting to the CPU count
+        batch_size: Candidates verified per batch; bounds memory use
+        engine: Verify in this process with the given engine instead of a pool
+
+    Returns:
+        Counters for the run
+    """
+    stats = MiningStats()
+    candidates = _candidates(moves, store, stats)
+
+    if engine is not None:
+        while batch := list(islice(candidates, batch_size)):
+            puzzles = [_verify(engine, candidate) for candidate in batch]
+            _store_batch(store, puzzles, stats)
+        return stats
+
+    with Pool(
+        workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(settings.stockfish_path, verification_profile()),
+    ) as pool:
+        while batch := list(islice(candidates, batch_size)):
+            puzzles = list(pool.imap_unordered(_verify_in_worker, batch))
+            _store_batch(store, puzzles, stats)
+    return stats
+
+
+def _store_batch(store: PuzzleStore, puzzles: list[Verified], stats: MiningStats) -> None:
+    errors = [puzzle for puzzle in puzzles if isinstance(puzzle, str)]
+    for error in errors:
+        logger.warning(f"Skipping candidate that failed verification: {error}")
+    stats.invalid += len(errors)
+    verified = [puzzle for puzzle in puzzles if isinstance(puzzle, Puzzle)]
+    stats.rejected += len(puzzles) - len(verified) - len(errors)
+    stored = store.add_many(verified)
+    # Positions repeated within a batch are only caught on insert.
+    stats.duplicates += len(verified) - stored
+    stats.stored += stored
+
+
+def read_moves(lines: Iterable[str]) -> Iterator[PlayerMove]:
+    """Parse JSON lines of analysed moves with an optional ``player_id`` field.
+
+    Malformed lines are logged and skipped.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            player_id = record.pop("player_id", None)
+            move = AnalysedMove(**record)
+        except (ValueError, TypeError, AttributeError, ValidationError) as exc:
+            logger.warning(f"Skipping malformed line {number}: {exc}")
+            continue
+        yield player_id, move
+
+
+if __name__ == "__main__":
+    puzzle_store = PuzzleStore(settings.puzzle_db_path)
+    with open(sys.argv[1]) if len(sys.argv) > 1 else sys.stdin as archive:
+        print(mine_puzzles(read_moves(archive), puzzle_store).model_dump_json())
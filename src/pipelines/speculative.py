@@ -0,0 +1,143 @@
+"""Speculative pre-analysis of likely replies during the user's think time.
+
+While a position is on screen, a background MultiPV search picks the most
+likely moves and analyses each of them into the evaluation cache, so that
+``analyze_post_move`` answers instantly when one of them is played. The
+speculative engine runs at the lowest scheduling priority and its work is
+abandoned as soon as the real move arrives.
+"""
+
+import os
+import threading
+import typing
+
+from src.chess.cache import EvaluationCache, evaluation_cache
+from src.chess.engine import EnginePool, ProfiledStockfish, engine_pool
+from src.core import get_logger, settings
+from src.pipelines.post_move import calculate_delta, get_side_to_move
+
+logger = get_logger(__name__)
+
+
+def lower_priority(engine: ProfiledStockfish, niceness: int) -> None:
+    """Renice an engine process so it only uses otherwise idle CPU."""
+    if not hasattr(os, "setpriority"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, engine._stockfish.pid, niceness)
+    except OSError as exc:
+        logger.warning(f"Could not lower speculative engine priority: {exc}")
+
+
+class SpeculativeAnalyzer:
+    """Background pre-analysis for one live position at a time.
+
+    Each analyzer owns a dedicated, reniced engine for its profile so that
+    speculation never competes with pooled engines serving real requests.
+    """
+
+    def __init__(
+        self,
+        profile: str | None = None,
+        candidates: int | None = None,
+        cache: EvaluationCache = evaluation_cache,
+        pool: EnginePool = engine_pool,
+    ) -> None:
+        self.profile = pool.resolve(profile)
+        self.candidates = candidates or settings.speculative_candidates
+        self.cache = cache
+        self._pool = pool
+        self._engine: ProfiledStockfish | None = None
+        self._engine_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, fen: str) -> None:
+        """Cancel any running speculation and start pre-analysing ``fen``."""
+        self.cancel()
+        cancelled = threading.Event()
+        self._cancelled = cancelled
+        self._thread = threading.Thread(
+            target=self._run, args=(fen, cancelled), name="speculative-analysis", daemon=True
+        )
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Abandon the current speculation, stopping any in-flight search."""
+        self._cancelled.set()
+        engine = self._engine
+        if engine is not None:
+            engine.stop()
+
+    def close(self) -> None:
+        """Cancel speculation and shut the speculative engine down."""
+        self.cancel()
+        engine, self._engine = self._engine, None
+        if engine is not None:
+            engine.quit()
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until the current speculation finishes or is abandoned."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _get_engine(self) -> ProfiledStockfish:
+        if self._engine is None:
+            self._engine = ProfiledStockfish(self._pool.path, self._pool.profiles[self.profile])
+            lower_priority(self._engine, settings.speculative_niceness)
+        return self._engine
+
+    def _run(self, fen: str, cancelled: threading.Event) -> None:
+        with self._engine_lock:
+            try:
+                self.analyze(fen, cancelled)
+            except Exception as exc:
+                # A broken speculative engine must never affect real analyses.
+                logger.warning(f"Speculative analysis failed: {exc}")
+                self._engine = None
+
+    def analyze(self, fen: str, cancelled: threading.Event) -> int:
+        """Pre-analyse the top candidate moves of ``fen`` into the cache.
+
+        Searches interrupted by cancellation are discarded, since a stopped
+        search returns a shallower evaluation than a real analysis would.
+
+        Args:
+            fen: Position the user is thinking about
+            cancelled: Set when the real move arrives
+
+        Returns:
+            Number of candidate moves cached
+        """
+        engine = self._get_engine()
+        # Searches starting after cancellation run at depth 1 and are discarded.
+        engine.cancelled = cancelled
+        side_to_move = get_side_to_move(fen)
+
+        # Keep the hash: consecutive positions of a live game are related.
+        engine.set_fen_position(fen, False)
+        evaluation_before = engine.get_evaluation()
+        if cancelled.is_set():
+            return 0
+        top_moves = engine.get_top_moves(self.candidates)
+
+        cached = 0
+        for candidate in top_moves:
+            move_uci = candidate["Move"]
+            if cancelled.is_set():
+                break
+            if self.cache.get(self.profile, fen, move_uci) is not None:
+                continue
+            engine.set_fen_position(fen, False)
+            engine.make_moves_from_current_position([move_uci])
+            evaluation_after = engine.get_evaluation()
+            if cancelled.is_set():
+                break
+            analysis: dict[str, typing.Any] = {
+                "before": evaluation_before,
+                "after": evaluation_after,
+                "delta": calculate_delta(evaluation_before, evaluation_after, side_to_move),
+            }
+            self.cache.put(self.profile, fen, move_uci, analysis)
+            cached += 1
+        return cached
@@ -0,0 +1,5 @@
+"""Per-player profile aggregation over analysed games."""
+
+from .store import PlayerProfileStore, aggregate_game, game_phase
+
+__all__ = ["PlayerProfileStore", "aggregate_game", "game_phase"]
@@ -0,0 +1,206 @@
+"""Incremental per-player aggregation backed by SQLite.
+
+Each analysed game is folded into a handful of counter rows per player
+(one per game phase, one per opening, one for time pressure), so recording
+a game costs O(moves in the game) and reading a profile never touches raw
+move data.
+"""
+
+import sqlite3
+import threading
+import typing
+from collections import defaultdict
+from pathlib import Path
+
+from src.classification.move_quality import MoveQuality, classify_move
+from src.models.profiles import AnalysedGame, AnalysedMove, BucketStats, PlayerProfile
+from src.pipelines.post_move import get_side_to_move
+
+Phase = typing.Literal["opening", "middlegame", "endgame"]
+
+OPENING_MAX_FULLMOVE = 12
+ENDGAME_MAX_PIECES = 6
+
+_COUNTER_COLUMNS = (
+    "moves",
+    "best",
+    "good",
+    "inaccuracy",
+    "mistake",
+    "blunder",
+    "cp_moves",
+    "cp_loss",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS players (
+    player_id TEXT PRIMARY KEY,
+    games INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS player_games (
+    player_id TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    PRIMARY KEY (player_id, game_id)
+);
+CREATE TABLE IF NOT EXISTS bucket_stats (
+    player_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    {", ".join(f"{column} INTEGER NOT NULL DEFAULT 0" for column in _COUNTER_COLUMNS)},
+    PRIMARY KEY (player_id, kind, bucket)
+);
+"""
+
+_UPSERT_BUCKET = f"""
+INSERT INTO bucket_stats (player_id, kind, bucket, {", ".join(_COUNTER_COLUMNS)})
+VALUES (?, ?, ?, {", ".join("?" for _ in _COUNTER_COLUMNS)})
+ON CONFLICT (player_id, kind, bucket) DO UPDATE SET
+{", ".join(f"{column} = {column} + excluded.{column}" for column in _COUNTER_COLUMNS)}
+"""
+
+
+def game_phase(fen: str) -> Phase:
+    """Classify a position as opening, middlegame or endgame.
+
+    Endgames are detected by the number of remaining queens, rooks, bishops
+    and knights (both sides); the opening is the first moves of the game
+    while material is still on the board.
+    """
+    placement, *_, fullmove = fen.split()
+    pieces = sum(1 for square in placement if square in "qrbnQRBN")
+    if pieces <= ENDGAME_MAX_PIECES:
+        return "endgame"
+    if int(fullmove) <= OPENING_MAX_FULLMOVE:
+        return "opening"
+    return "middlegame"
+
+
+def centipawn_loss(delta: int | None) -> int | None:
+    """Mover-relative centipawn loss for a move, or None for mate evaluations."""
+    if delta is None:
+        return None
+    return max(0, -delta)
+
+
+def _add_move(stats: BucketStats, quality: MoveQuality, cp_loss: int | None) -> None:
+    stats.moves += 1
+    setattr(stats, quality.value, getattr(stats, quality.value) + 1)
+    if cp_loss is not None:
+        stats.cp_moves += 1
+        stats.cp_loss += cp_loss
+
+
+def aggregate_game(
+    game: AnalysedGame, time_pressure_seconds: float
+) -> dict[tuple[str, str], BucketStats]:
+    """Fold a game's moves into per-bucket counters.
+
+    Only moves played by ``game.color`` are counted.
+
+    Args:
+        game: Analysed game
+        time_pressure_seconds: Clock threshold for the time pressure bucket
+
+    Returns:
+        Counters keyed by ``(kind, bucket)``
+    """
+    buckets: dict[tuple[str, str], BucketStats] = defaultdict(BucketStats)
+    for move in game.moves:
+        side_to_move = get_side_to_move(move.fen_before)
+        if side_to_move != game.color:
+            continue
+        quality = _classify(move, game.color)
+        cp_loss = centipawn_loss(move.delta)
+
+        keys = [("overall", ""), ("phase", game_phase(move.fen_before)), ("opening", game.opening)]
+        if move.clock_seconds is not None and move.clock_seconds < time_pressure_seconds:
+            keys.append(("time_pressure", ""))
+        for key in keys:
+            _add_move(buckets[key], quality, cp_loss)
+    return dict(buckets)
+
+
+def _classify(move: AnalysedMove, side_to_move: typing.Literal["w", "b"]) -> MoveQuality:
+    return classify_move(move.model_dump(include={"before", "after", "delta"}), side_to_move)
+
+
+class PlayerProfileStore:
+    """SQLite store of rolling per-player statistics."""
+
+    def __init__(self, path: str | Path, time_pressure_seconds: float = 30.0) -> None:
+        self.time_pressure_seconds = time_pressure_seconds
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def record_game(self, player_id: str, game: AnalysedGame) -> bool:
+        """Fold a newly analysed game into the player's aggregates.
+
+        Args:
+            player_id: Player identifier
+            game: Analysed game
+
+        Returns:
+            False if the game was already recorded for this player
+        """
+        buckets = aggregate_game(game, self.time_pressure_seconds)
+        rows = [
+            (player_id, kind, bucket, *(getattr(stats, column) for column in _COUNTER_COLUMNS))
+            for (kind, bucket), stats in buckets.items()
+        ]
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO player_games (player_id, game_id) VALUES (?, ?)",
+                (player_id, game.game_id),
+            ).rowcount
+            if not inserted:
+                return False
+            self._conn.execute(
+                "INSERT INTO players (player_id, games) VALUES (?, 1) "
+                "ON CONFLICT (player_id) DO UPDATE SET games = games + 1",
+                (player_id,),
+            )
+            self._conn.executemany(_UPSERT_BUCKET, rows)
+        return True
+
+    def get_profile(self, player_id: str) -> PlayerProfile | None:
+        """Read a player's precomputed aggregates.
+
+        Args:
+            player_id: Player identifier
+
+        Returns:
+            The player's profile, or None if no game was recorded
+        """
+        with self._lock:
+            player = self._conn.execute(
+                "SELECT games FROM players WHERE player_id = ?", (player_id,)
+            ).fetchone()
+            if player is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT * FROM bucket_stats WHERE player_id = ?", (player_id,)
+            ).fetchall()
+
+        profile = PlayerProfile(player_id=player_id, games=player["games"])
+        for row in rows:
+            stats = BucketStats(**{column: row[column] for column in _COUNTER_COLUMNS})
+            if row["kind"] == "overall":
+                profile.overall = stats
+            elif row["kind"] == "phase":
+                profile.phases[row["bucket"]] = stats
+            elif row["kind"] == "opening":
+                profile.openings[row["bucket"]] = stats
+            elif row["kind"] == "time_pressure":
+                profile.time_pressure = stats
+        return profile
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,5 @@
+"""Training puzzles mined from analysed games."""
+
+from .store import PuzzleStore, normalize_position
+
+__all__ = ["PuzzleStore", "normalize_position"]
@@ -0,0 +1,93 @@
+"""Indexed SQLite store of mined puzzles."""
+
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+import chess
+
+from src.models.puzzles import Puzzle
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    position TEXT PRIMARY KEY,
+    fen TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    played_move TEXT NOT NULL,
+    quality TEXT NOT NULL,
+    gap_cp INTEGER NOT NULL,
+    player_id TEXT
+);
+CREATE INDEX IF NOT EXISTS puzzles_player ON puzzles (player_id, quality);
+CREATE INDEX IF NOT EXISTS puzzles_quality ON puzzles (quality, gap_cp);
+"""
+
+_COLUMNS = ("position", "fen", "solution", "played_move", "quality", "gap_cp", "player_id")
+
+
+def normalize_position(fen: str) -> str:
+    """Normalize a FEN for deduplication.
+
+    Move counters are dropped and the en passant square is kept only when
+    an en passant capture is actually legal, so transpositions collapse to
+    the same key.
+    """
+    return chess.Board(fen).epd()
+
+
+class PuzzleStore:
+    """SQLite store of puzzles, deduplicated by normalized position."""
+
+    def __init__(self, path: str | Path) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def contains(self, position: str) -> bool:
+        """Check whether a normalized position is already stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM puzzles WHERE position = ?", (position,)
+            ).fetchone()
+        return row is not None
+
+    def add_many(self, puzzles: Iterable[Puzzle]) -> int:
+        """Store puzzles, skipping positions that are already present.
+
+        Returns:
+            Number of puzzles newly stored
+        """
+        rows = [tuple(getattr(puzzle, column) for column in _COLUMNS) for puzzle in puzzles]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO puzzles ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def for_player(self, player_id: str, limit: int = 50) -> list[Puzzle]:
+        """Puzzles mined from a player's own games, largest gaps first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM puzzles WHERE player_id = ? ORDER BY gap_cp DESC LIMIT ?",
+                (player_id, limit),
+            ).fetchall()
+        return [Puzzle(**dict(row)) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            count: int = self._conn.execute("SELECT COUNT(*) FROM puzzles").fetchone()[0]
+        return count
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
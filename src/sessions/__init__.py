@@ -0,0 +1,5 @@
+"""Live game sessions held server-side."""
+
+from .manager import GameSession, SessionCapacityError, SessionManager, SessionNotFoundError
+
+__all__ = ["GameSession", "SessionCapacityError", "SessionManager", "SessionNotFoundError"]
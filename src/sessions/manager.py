@@ -0,0 +1,305 @@
+"""Server-side live game sessions.
+
+A session keeps the python-chess board and a sticky engine for one game, so
+clients send only UCI moves. The engine is fed ``position ... moves ...``
+deltas without ``ucinewgame``, keeping its hash warm, and the evaluation
+after each move is reused as the evaluation before the next one.
+"""
+
+import contextlib
+import threading
+import time
+import typing
+import uuid
+from collections import OrderedDict
+
+import chess
+from stockfish import StockfishException
+
+from src.chess.cache import EvaluationCache, evaluation_cache
+from src.chess.engine import EnginePool, ProfiledStockfish, engine_pool
+from src.chess.opening_book import get_opening_book
+from src.core import get_logger, settings
+from src.core.profiling import stage
+from src.pipelines.post_move import calculate_delta
+from src.pipelines.speculative import SpeculativeAnalyzer
+
+logger = get_logger(__name__)
+
+# Rough resident size of a Stockfish process excluding its hash table.
+ENGINE_BASE_MB = 64
+
+
+class SessionNotFoundError(KeyError):
+    """Raised when a session id is unknown or has expired."""
+
+
+class SessionCapacityError(RuntimeError):
+    """Raised when a new session does not fit in the memory budget."""
+
+
+class GameSession:
+    """A live game with its board and a dedicated engine."""
+
+    def __init__(
+        self,
+        profile: str,
+        pool: EnginePool,
+        start_fen: str | None = None,
+        cache: EvaluationCache = evaluation_cache,
+        speculate: bool = False,
+    ) -> None:
+        board = chess.Board() if start_fen is None else chess.Board(start_fen)
+        if not board.is_valid():
+            raise ValueError("Invalid Fen!")
+
+        self.session_id = uuid.uuid4().hex
+        self.profile = profile
+        self.start_fen = start_fen
+        self.board = board
+        self.moves: list[str] = []
+        self.cache = cache
+        self.closed = False
+        self.last_used = time.monotonic()
+        self.memory_mb = ENGINE_BASE_MB + pool.profiles[profile].hash_mb
+
+        self._pool = pool
+        self._engine = ProfiledStockfish(pool.path, pool.profiles[profile])
+        self._evaluation: dict[str, typing.Any] | None = None
+        self._lock = threading.Lock()
+
+        self._speculation: SpeculativeAnalyzer | None = None
+        if speculate:
+            self._speculation = SpeculativeAnalyzer(profile, cache=cache, pool=pool)
+            self.memory_mb *= 2
+            self._speculation.start(self.fen)
+
+    @property
+    def fen(self) -> str:
+        """Current position in FEN."""
+        return self.board.fen()
+
+    def play(self, move_uci: str) -> tuple[dict[str, typing.Any], typing.Literal["w", "b"]]:
+        """Play a move and analyse it.
+
+        Args:
+            move_uci: Move in UCI notation
+
+        Returns:
+            The post-move analysis and the side that played the move
+
+        Raises:
+            ValueError: If the move is not legal in the current position
+            SessionNotFoundError: If the session has been closed
+            StockfishException: If the engine fails again after a restart
+        """
+        with self._lock:
+            if self.closed:
+                raise SessionNotFoundError(self.session_id)
+            self.last_used = time.monotonic()
+            move = self.board.parse_uci(move_uci)
+            fen_before = self.fen
+            side_to_move: typing.Literal["w", "b"] = "w" if self.board.turn else "b"
+            if self._speculation is not None:
+                self._speculation.cancel()
+
+            with stage("opening_book"):
+                analysis = self._from_book(move, side_to_move)
+            if analysis is None:
+                with stage("cache"):
+                    analysis = self.cache.get(self.profile, fen_before, move_uci)
+            if analysis is None:
+                with stage("search_before"):
+                    evaluation_before = self._evaluation or self._evaluate()
+                self.board.push(move)
+                self.moves.append(move_uci)
+                try:
+                    with stage("search_after"):
+                        evaluation_after = self._evaluate()
+                except Exception:
+                    self.board.pop()
+                    self.moves.pop()
+                    raise
+                with stage("calculate_delta"):
+                    delta = calculate_delta(evaluation_before, evaluation_after, side_to_move)
+                # Not cached: with the game history the engine may score differently
+                # than for the bare FEN, e.g. around repetitions.
+                analysis = {"before": evaluation_before, "after": evaluation_after, "delta": delta}
+            else:
+                self.board.push(move)
+                self.moves.append(move_uci)
+
+            self._evaluation = analysis["after"]
+            if self._speculation is not None and not self.board.is_game_over():
+                self._speculation.start(self.fen)
+            return analysis, side_to_move
+
+    def _from_book(
+        self, move: chess.Move, side_to_move: typing.Literal["w", "b"]
+    ) -> dict[str, typing.Any] | None:
+        book = get_opening_book()
+        evaluations = None if book is None else book.evaluations(self.board, move)
+        if evaluations is None:
+            return None
+        evaluation_before, evaluation_after = evaluations
+        return {
+            "before": evaluation_before,
+            "after": evaluation_after,
+            "delta": calculate_delta(evaluation_before, evaluation_after, side_to_move),
+        }
+
+    def _evaluate(self) -> dict[str, typing.Any]:
+        try:
+            return self._search()
+        except (StockfishException, BrokenPipeError) as exc:
+            if self.closed:
+                raise
+            # The whole game is replayed on every search, so a fresh engine can take over.
+            logger.warning(f"Engine of session {self.session_id} failed, restarting: {exc}")
+            with contextlib.suppress(Exception):
+                self._engine.quit()
+            self._engine = ProfiledStockfish(self._pool.path, self._pool.profiles[self.profile])
+            return self._search()
+
+    def _search(self) -> dict[str, typing.Any]:
+        self._engine.set_game_position(self.moves, self.start_fen)
+        evaluation: dict[str, typing.Any] = self._engine.get_evaluation()
+        return evaluation
+
+    def close(self) -> None:
+        """Shut down the session's engines, waiting for a move in progress."""
+        with self._lock:
+            self.closed = True
+            if self._speculation is not None:
+                self._speculation.close()
+            self._engine.quit()
+
+
+class SessionManager:
+    """Registry of live sessions with idle expiry and a memory budget."""
+
+    def __init__(
+        self,
+        pool: EnginePool = engine_pool,
+        idle_seconds: float | None = None,
+        memory_mb: int | None = None,
+        speculate: bool | None = None,
+    ) -> None:
+        self.pool = pool
+        self.idle_seconds = idle_seconds or settings.session_idle_seconds
+        self.memory_mb = settings.session_memory_mb if memory_mb is None else memory_mb
+        self.speculate = settings.session_speculation if speculate is None else speculate
+        # Ordered by last use, least recent first.
+        self._sessions: OrderedDict[str, GameSession] = OrderedDict()
+        # Memory of sessions being opened, reserved before their engines start.
+        self._reserved_mb = 0
+        self._lock = threading.Lock()
+
+    def open(self, start_fen: str | None = None, profile: str | None = None) -> GameSession:
+        """Open a session, evicting least recently used sessions if over budget.
+
+        Raises:
+            ValueError: If the FEN or profile is invalid
+            SessionCapacityError: If the session cannot fit in the memory budget
+        """
+        name = self.pool.resolve(profile)
+        needed = ENGINE_BASE_MB + self.pool.profiles[name].hash_mb
+        if self.speculate:
+            needed *= 2
+        if needed > self.memory_mb:
+            raise SessionCapacityError("Session does not fit in the session memory budget")
+
+        evicted: list[GameSession] = []
+        with self._lock:
+            evicted.extend(self._expire_locked())
+            while self._sessions and self.used_memory_mb + needed > self.memory_mb:
+                _, session = self._sessions.popitem(last=False)
+                evicted.append(session)
+            fits = self.used_memory_mb + needed <= self.memory_mb
+            if fits:
+                self._reserved_mb += needed
+        for session in evicted:
+            session.close()
+        if not fits:
+            raise SessionCapacityError("Session memory budget is taken by sessions being opened")
+
+        try:
+            session = GameSession(name, self.pool, start_fen, speculate=self.speculate)
+        except BaseException:
+            with self._lock:
+                self._reserved_mb -= needed
+            raise
+        with self._lock:
+            self._reserved_mb -= needed
+            self._sessions[session.session_id] = session
+        logger.info(f"Opened session {session.session_id} ({name})")
+        return session
+
+    def get(self, session_id: str) -> GameSession:
+        """Look up a live session and mark it as used.
+
+        Raises:
+            SessionNotFoundError: If the session is unknown or expired
+        """
+        with self._lock:
+            expired = self._expire_locked()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = time.monotonic()
+                self._sessions.move_to_end(session_id)
+        for stale in expired:
+            stale.close()
+        if session is None:
+            raise SessionNotFoundError(session_id)
+        return session
+
+    def expire(self) -> int:
+        """Close sessions idle for longer than ``idle_seconds``.
+
+        Returns:
+            Number of sessions closed
+        """
+        with self._lock:
+            expired = self._expire_locked()
+        for session in expired:
+            session.close()
+        return len(expired)
+
+    def close(self, session_id: str) -> None:
+        """Close a session and release its engines.
+
+        Raises:
+            SessionNotFoundError: If the session is unknown or expired
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            raise SessionNotFoundError(session_id)
+        session.close()
+
+    def close_all(self) -> None:
+        """Close every live session."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    @property
+    def used_memory_mb(self) -> int:
+        """Approximate memory held by live sessions and sessions being opened."""
+        return self._reserved_mb + sum(session.memory_mb for session in self._sessions.values())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _expire_locked(self) -> list[GameSession]:
+        deadline = time.monotonic() - self.idle_seconds
+        expired = []
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used > deadline:
+                break
+            del self._sessions[session_id]
+            expired.append(session)
+        return expired
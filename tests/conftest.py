@@ -1,7 +1,12 @@
 """Pytest configuration and fixtures."""
 
+from collections.abc import Iterator
+
 import pytest
 
+from src.chess.cache import evaluation_cache
+from src.chess.engine import engine_pool
+
 
 @pytest.fixture
 def mock_env(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -9,3 +14,13 @@ def mock_env(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("ENVIRONMENT", "development")
     monkeypatch.setenv("LOG_LEVEL", "DEBUG")
     monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+
+@pytest.fixture(autouse=True)
+def clear_engine_state() -> Iterator[None]:
+    """Keep warm engines and cached analyses from leaking between tests."""
+    engine_pool.clear()
+    evaluation_cache.clear()
+    yield
+    engine_pool.clear()
+    evaluation_cache.clear()
@@ -0,0 +1,192 @@
+import itertools
+import struct
+from unittest.mock import Mock, patch
+
+import chess
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import create_app
+from src.chess.cache import evaluation_cache
+from src.chess.packing import pack_fen, unpack_fen
+from src.classification.move_quality import MoveQuality
+from src.loadtest.harness import random_games
+from src.pipelines.bulk import (
+    MEDIA_TYPE,
+    analyze_bulk,
+    decode_bulk_request,
+    decode_bulk_response,
+    encode_bulk_request,
+)
+
+START = chess.STARTING_FEN
+MOVES = [
+    (START, "e2e4"),
+    ("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1", "e7e5"),
+    ("r3k2r/8/8/8/8/8/8/R3K2R w Kq - 3 40", "e1g1"),
+    ("8/P7/8/8/8/8/8/k6K w - - 0 1", "a7a8q"),
+]
+EVALUATIONS = [
+    {"type": "cp", "value": 20},
+    {"type": "cp", "value": 35},
+    {"type": "cp", "value": 35},
+    {"type": "cp", "value": -200},
+    {"type": "mate", "value": 3},
+    {"type": "cp", "value": 0},
+    {"type": "cp", "value": 900},
+    {"type": "mate", "value": 2},
+]
+
+
+@pytest.fixture
+def mock_engine():
+    with patch("src.chess.engine.ProfiledStockfish") as mock_stockfish_class:
+        engine = Mock()
+        mock_stockfish_class.return_value = engine
+        yield engine
+
+
+class TestPacking:
+    @pytest.mark.parametrize("fen", [fen for fen, _ in MOVES])
+    def test_round_trip(self, fen):
+        assert unpack_fen(pack_fen(fen)) == fen
+
+    def test_random_games_round_trip(self):
+        for game in random_games(10, 80, seed=3):
+            for fen, _ in game:
+                assert unpack_fen(pack_fen(fen)) == fen
+
+    def test_smaller_than_fen(self):
+        assert len(pack_fen(START)) == 30 < len(START)
+
+    @pytest.mark.parametrize(
+        "fen",
+        [
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "rnbqkbnr/ppppxppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "1r2k1r1/8/8/8/8/8/8/1R2K1R1 w GBgb - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e9 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 70000",
+        ],
+    )
+    def test_invalid_fen(self, fen):
+        with pytest.raises(ValueError):
+            pack_fen(fen)
+
+    def test_truncated(self):
+        with pytest.raises(ValueError):
+            unpack_fen(pack_fen(START)[:-1])
+
+
+class TestBulkRequest:
+    def test_round_trip(self, mock_engine):
+        request = decode_bulk_request(encode_bulk_request(MOVES, "blitz"))
+        assert request.profile == "blitz"
+        assert list(zip(request.fens, request.moves, strict=True)) == MOVES
+
+    def test_fen_strings(self, mock_engine):
+        request = decode_bulk_request(encode_bulk_request(MOVES, pack_positions=False))
+        assert request.fens == [fen for fen, _ in MOVES]
+
+    def test_default_profile(self, mock_engine):
+        assert decode_bulk_request(encode_bulk_request(MOVES)).profile == "standard"
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            [],
+            {"positions": [pack_fen(START)], "moves": b""},
+            {"positions": [b"\x00"], "moves": b"\x00\x00"},
+            {"positions": [pack_fen(START)], "moves": struct.pack("<H", 7 << 12)},
+            {"positions": [], "moves": b"", "profile": "unknown"},
+        ],
+    )
+    def test_invalid(self, payload):
+        with pytest.raises(ValueError):
+            decode_bulk_request(msgpack.packb(payload))
+
+    def test_not_msgpack(self):
+        with pytest.raises(ValueError):
+            decode_bulk_request(b"\xc1")
+
+
+def test_chunks_and_row_errors(mock_engine) -> None:
+    """Test chunked results with a failed row in the middle."""
+    mock_engine.get_evaluation.side_effect = itertools.cycle(EVALUATIONS[:2])
+    request = decode_bulk_request(encode_bulk_request(MOVES[:3]))
+    # Parses, but python-chess rejects a position with two white kings.
+    request.fens[1] = "4k3/8/8/8/8/8/8/K3K3 w - - 0 1"
+
+    chunks = list(analyze_bulk(request, chunk_size=2))
+    body = b"".join(chunks)
+    results = list(decode_bulk_response(body[i : i + 7] for i in range(0, len(body), 7)))
+
+    assert len(chunks) == 2
+    assert [result.index for result in results] == [0, 1, 2]
+    assert results[1].analysis is None
+    assert results[1].error == "Invalid Fen!"
+    assert results[2].analysis.delta == 15
+    assert results[2].analysis.quality == MoveQuality.INACCURACY
+
+
+def test_engine_failure_reported_per_row(mock_engine) -> None:
+    """Test that an engine crash fails only its own row."""
+    mock_engine.get_evaluation.side_effect = [
+        BrokenPipeError(),
+        *EVALUATIONS[2:4],
+    ]
+    request = decode_bulk_request(encode_bulk_request(MOVES[:2]))
+
+    results = list(decode_bulk_response(analyze_bulk(request)))
+
+    assert results[0].error == "Engine failure"
+    assert results[1].analysis.delta == 235
+
+
+def test_bulk_endpoint_matches_json(mock_engine) -> None:
+    """Test that the bulk endpoint returns the same analyses as the JSON route."""
+    client = TestClient(create_app())
+
+    mock_engine.get_evaluation.side_effect = iter(EVALUATIONS)
+    expected = [
+        client.post("/analysis/move", json={"fen_before": fen, "move_uci": move}).json()
+        for fen, move in MOVES
+    ]
+
+    evaluation_cache.clear()
+    mock_engine.get_evaluation.side_effect = iter(EVALUATIONS)
+    response = client.post(
+        "/analysis/bulk",
+        content=encode_bulk_request(MOVES),
+        headers={"Content-Type": MEDIA_TYPE},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MEDIA_TYPE
+    results = list(decode_bulk_response(response.iter_bytes()))
+    assert [result.analysis.model_dump(mode="json") for result in results] == expected
+
+
+def test_bulk_endpoint_rejects_bad_requests(mock_engine, monkeypatch) -> None:
+    """Test content type, decoding and size errors."""
+    client = TestClient(create_app())
+    body = encode_bulk_request(MOVES)
+
+    assert client.post("/analysis/bulk", content=body).status_code == 415
+    response = client.post("/analysis/bulk", content=b"\xc1", headers={"Content-Type": MEDIA_TYPE})
+    assert response.status_code == 400
+
+    monkeypatch.setattr("src.api.analysis.settings.bulk_max_moves", 2)
+    response = client.post("/analysis/bulk", content=body, headers={"Content-Type": MEDIA_TYPE})
+    assert response.status_code == 413
+
+    monkeypatch.setattr("src.api.analysis.settings.bulk_max_body_bytes", len(body) - 1)
+    response = client.post("/analysis/bulk", content=body, headers={"Content-Type": MEDIA_TYPE})
+    assert response.status_code == 413
+    assert response.json()["detail"].endswith("bytes per request")
+    response = client.post(
+        "/analysis/bulk", content=iter([body]), headers={"Content-Type": MEDIA_TYPE}
+    )
+    assert response.status_code == 413
@@ -0,0 +1,171 @@
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from stockfish import StockfishException
+
+from src.api.main import create_app
+from src.chess.engine import EnginePool
+from src.core.config import EngineProfile, Settings
+
+PROFILES = {
+    "blitz": EngineProfile(depth=8),
+    "deep": EngineProfile(movetime_ms=500, threads=4, hash_mb=256),
+}
+
+
+class TestEngineProfile:
+    def test_requires_a_search_limit(self):
+        with pytest.raises(ValidationError):
+            EngineProfile()
+
+    def test_rejects_depth_and_movetime(self):
+        with pytest.raises(ValidationError):
+            EngineProfile(depth=10, movetime_ms=100)
+
+    def test_uci_options(self):
+        assert PROFILES["deep"].uci_options == {
+            "Threads": 4,
+            "Hash": 256,
+            "Skill Level": 20,
+        }
+
+    def test_multipv_not_applied_globally(self):
+        assert "MultiPV" not in EngineProfile(depth=10, multipv=3).uci_options
+
+    def test_settings_reject_unknown_default(self):
+        with pytest.raises(ValidationError):
+            Settings(default_engine_profile="missing")
+
+
+@patch("src.chess.engine.ProfiledStockfish")
+class TestEnginePool:
+    def test_engine_created_with_profile(self, mock_stockfish_class):
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        with pool.checkout("deep"):
+            pass
+        mock_stockfish_class.assert_called_once_with("/bin/stockfish", PROFILES["deep"])
+
+    def test_default_profile(self, mock_stockfish_class):
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        with pool.checkout():
+            pass
+        mock_stockfish_class.assert_called_once_with("/bin/stockfish", PROFILES["blitz"])
+        assert pool.idle_count("blitz") == 1
+
+    def test_engines_are_per_profile(self, mock_stockfish_class):
+        mock_stockfish_class.side_effect = lambda path, profile: Mock(profile=profile)
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        with pool.checkout("blitz") as blitz:
+            pass
+        with pool.checkout("deep") as deep:
+            pass
+        with pool.checkout("blitz") as blitz_again:
+            pass
+        assert blitz_again is blitz
+        assert deep is not blitz
+
+    def test_concurrent_checkouts_get_distinct_engines(self, mock_stockfish_class):
+        mock_stockfish_class.side_effect = lambda path, profile: Mock()
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        with pool.checkout() as first, pool.checkout() as second:
+            assert first is not second
+        assert pool.idle_count() == 2
+
+    def test_every_returned_engine_kept(self, mock_stockfish_class):
+        mock_stockfish_class.side_effect = lambda path, profile: Mock()
+        profiles = {"blitz": EngineProfile(depth=8, max_engines=3)}
+        pool = EnginePool("/bin/stockfish", profiles, "blitz")
+        for _ in range(2):
+            with pool.checkout(), pool.checkout(), pool.checkout():
+                pass
+        assert pool.idle_count() == 3
+        assert mock_stockfish_class.call_count == 3
+
+    def test_clear_quits_idle_engines(self, mock_stockfish_class):
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        with pool.checkout():
+            pass
+        pool.clear()
+        assert pool.idle_count() == 0
+        mock_stockfish_class.return_value.quit.assert_called_once()
+
+    def test_checkouts_capped_per_profile(self, mock_stockfish_class):
+        mock_stockfish_class.side_effect = lambda path, profile: Mock()
+        profiles = {"blitz": EngineProfile(depth=8, max_engines=1)}
+        pool = EnginePool("/bin/stockfish", profiles, "blitz")
+        acquired = threading.Event()
+
+        def borrow() -> None:
+            with pool.checkout():
+                acquired.set()
+
+        with pool.checkout():
+            thread = threading.Thread(target=borrow)
+            thread.start()
+            assert not acquired.wait(0.1)
+        thread.join(timeout=1)
+        assert acquired.is_set()
+        assert mock_stockfish_class.call_count == 1
+
+    def test_slot_released_after_crash(self, mock_stockfish_class):
+        profiles = {"blitz": EngineProfile(depth=8, max_engines=1)}
+        pool = EnginePool("/bin/stockfish", profiles, "blitz")
+        with pytest.raises(StockfishException), pool.checkout():
+            raise StockfishException("The Stockfish process has crashed")
+        with pool.checkout():
+            pass
+
+    def test_crashed_engine_discarded(self, mock_stockfish_class):
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        with pytest.raises(StockfishException), pool.checkout():
+            raise StockfishException("The Stockfish process has crashed")
+        assert pool.idle_count() == 0
+        mock_stockfish_class.return_value.quit.assert_called_once()
+
+    def test_engine_kept_after_invalid_input(self, mock_stockfish_class):
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        with pytest.raises(ValueError), pool.checkout():
+            raise ValueError("Invalid Fen!")
+        assert pool.idle_count() == 1
+
+
+@patch("src.chess.engine.ProfiledStockfish")
+def test_analysis_endpoint(mock_stockfish_class) -> None:
+    """Test single move analysis over the API."""
+    mock_engine = Mock()
+    mock_stockfish_class.return_value = mock_engine
+    mock_engine.get_evaluation.side_effect = [
+        {"type": "cp", "value": 100},
+        {"type": "cp", "value": -200},
+    ]
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/analysis/move",
+        json={
+            "fen_before": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "move_uci": "f2f3",
+            "profile": "blitz",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["delta"] == -300
+    assert response.json()["quality"] == "blunder"
+
+
+def test_analysis_endpoint_unknown_profile() -> None:
+    """Test that unknown engine profiles are rejected."""
+    client = TestClient(create_app())
+    response = client.post(
+        "/analysis/move",
+        json={
+            "fen_before": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "move_uci": "e2e4",
+            "profile": "missing",
+        },
+    )
+    assert response.status_code == 400
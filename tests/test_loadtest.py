@@ -0,0 +1,167 @@
+import time
+
+import pytest
+
+from src.chess.engine import ProfiledStockfish
+from src.core.config import EngineProfile
+from src.loadtest import SLO, FakeEngineConfig, LoadTestConfig, run_load_test
+from src.loadtest.harness import (
+    LatencyStats,
+    LoadTestReport,
+    check_slo,
+    percentile,
+    random_games,
+    summarize,
+    write_engine_script,
+)
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+@pytest.fixture
+def fake_engine(tmp_path):
+    script = write_engine_script(FakeEngineConfig(latency_ms=1, score_mean=50), tmp_path)
+    engine = ProfiledStockfish(str(script), EngineProfile(depth=10))
+    yield engine
+    engine.quit()
+
+
+class TestStatistics:
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 95) == 0.0
+
+    def test_summarize(self):
+        stats = summarize([(10.0, True), (30.0, False), (20.0, True)])
+        assert stats.requests == 3
+        assert stats.errors == 1
+        assert stats.max_ms == 30.0
+
+    def test_check_slo(self):
+        stats = LatencyStats(
+            requests=10, errors=1, error_rate=0.1, p50_ms=5, p95_ms=50, p99_ms=90, max_ms=100
+        )
+        report = LoadTestReport(
+            duration_seconds=1,
+            throughput=10,
+            overall=stats,
+            scenarios={},
+            slo_violations=[],
+        )
+        assert check_slo(report, SLO(p95_ms=100, p99_ms=100, max_error_rate=0.2)) == []
+        violations = check_slo(report, SLO(p95_ms=40, p99_ms=100, min_throughput=20))
+        assert len(violations) == 3
+
+    def test_random_games_are_reproducible(self):
+        assert random_games(2, 6, seed=1) == random_games(2, 6, seed=1)
+        assert all(len(game) == 6 for game in random_games(2, 6, seed=1))
+
+
+class TestFakeEngine:
+    def test_evaluation(self, fake_engine):
+        fake_engine.set_fen_position(START_FEN)
+        evaluation = fake_engine.get_evaluation()
+        assert evaluation["type"] == "cp"
+        fake_engine.set_fen_position(START_FEN)
+        assert fake_engine.get_evaluation() == evaluation
+
+    def test_moves_and_game_positions(self, fake_engine):
+        fake_engine.set_fen_position(START_FEN)
+        fake_engine.make_moves_from_current_position(["e2e4"])
+        assert fake_engine.get_fen_position().split()[1] == "b"
+        fake_engine.set_game_position(["e2e4", "e7e5"])
+        assert fake_engine.get_fen_position().startswith("rnbqkbnr/pppp1ppp/8/4p3/4P3/")
+
+    def test_top_moves(self, fake_engine):
+        fake_engine.set_fen_position(START_FEN)
+        top_moves = fake_engine.get_top_moves(3)
+        assert len(top_moves) == 3
+        assert len({move["Move"] for move in top_moves}) == 3
+
+    def test_top_moves_ordered_for_black(self, tmp_path):
+        script = write_engine_script(FakeEngineConfig(latency_ms=1, score_mean=50), tmp_path)
+        engine = ProfiledStockfish(str(script), EngineProfile(depth=10))
+        try:
+            for fen, _ in random_games(1, 6, seed=4)[0]:
+                engine.set_fen_position(fen)
+                top_moves = engine.get_top_moves(4)
+                sign = 1 if fen.split()[1] == "w" else -1
+                scores = [sign * move["Centipawn"] for move in top_moves]
+                assert scores == sorted(scores, reverse=True)
+        finally:
+            engine.quit()
+
+    def test_scores_are_white_relative(self, tmp_path):
+        script = write_engine_script(
+            FakeEngineConfig(latency_ms=1, score_mean=20, score_stddev=0), tmp_path
+        )
+        engine = ProfiledStockfish(str(script), EngineProfile(depth=10))
+        try:
+            evaluations = []
+            for fen, _ in random_games(1, 4, seed=1)[0]:
+                engine.set_fen_position(fen)
+                evaluations.append(engine.get_evaluation())
+        finally:
+            engine.quit()
+        assert evaluations == [{"type": "cp", "value": 20}] * 4
+
+    def test_movetime(self, tmp_path):
+        script = write_engine_script(FakeEngineConfig(latency_ms=1), tmp_path)
+        engine = ProfiledStockfish(str(script), EngineProfile(movetime_ms=200))
+        try:
+            engine.set_fen_position(START_FEN)
+            started = time.perf_counter()
+            engine.get_evaluation()
+            elapsed = time.perf_counter() - started
+        finally:
+            engine.quit()
+        assert elapsed >= 0.2
+
+    def test_top_moves_with_movetime(self, tmp_path):
+        script = write_engine_script(FakeEngineConfig(latency_ms=1), tmp_path)
+        engine = ProfiledStockfish(str(script), EngineProfile(movetime_ms=50, multipv=3))
+        try:
+            engine.set_fen_position(START_FEN)
+            top_moves = engine.get_top_moves()
+            engine.set_fen_position(START_FEN)
+            evaluation = engine.get_evaluation()
+        finally:
+            engine.quit()
+        assert len(top_moves) == 3
+        assert evaluation["type"] == "cp"
+
+    def test_multipv_profile_evaluates_best_line(self, tmp_path):
+        script = write_engine_script(FakeEngineConfig(latency_ms=1, score_mean=50), tmp_path)
+        engine = ProfiledStockfish(str(script), EngineProfile(depth=10, multipv=3))
+        try:
+            engine.set_fen_position(START_FEN)
+            evaluation = engine.get_evaluation()
+            engine.set_fen_position(START_FEN)
+            top_moves = engine.get_top_moves()
+        finally:
+            engine.quit()
+        assert len(top_moves) == 3
+        assert evaluation == {"type": "cp", "value": top_moves[0]["Centipawn"]}
+
+
+def test_run_load_test() -> None:
+    """Test a short end-to-end run against the fake engine."""
+    report = run_load_test(
+        LoadTestConfig(
+            concurrency=2,
+            duration_seconds=0.5,
+            mix={"game": 1, "stream": 1},
+            game_plies=2,
+            corpus_games=1,
+            warmup_seconds=1.0,
+            engine=FakeEngineConfig(latency_ms=1, latency_jitter_ms=0),
+            slo=SLO(p95_ms=60_000, p99_ms=60_000),
+        )
+    )
+    assert report.overall.requests > 0
+    assert report.overall.errors == 0
+    assert report.passed
+    # Once warm, the same two moves are served from the cache.
+    assert report.cache_hit_ratio > 0.8
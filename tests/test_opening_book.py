@@ -0,0 +1,140 @@
+from unittest.mock import patch
+
+import chess
+import pytest
+
+from src.chess.opening_book import (
+    OpeningBook,
+    build_opening_book,
+    decode_move,
+    encode_move,
+    get_opening_book,
+)
+from src.classification.move_quality import MoveQuality
+from src.models.profiles import AnalysedMove
+from src.pipelines.post_move import analyze_post_move
+
+START_FEN = chess.STARTING_FEN
+AFTER_E4 = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+AFTER_E4_E5 = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+
+
+def analysed(fen: str, move: str, before: int, after: int) -> AnalysedMove:
+    side = 1 if fen.split()[1] == "w" else -1
+    return AnalysedMove(
+        fen_before=fen,
+        move_uci=move,
+        before={"type": "cp", "value": before},
+        after={"type": "cp", "value": after},
+        delta=(after - before) * side,
+    )
+
+
+def corpus() -> list[list[AnalysedMove]]:
+    e4_game = [
+        analysed(START_FEN, "e2e4", 30, 35),
+        analysed(AFTER_E4, "e7e5", 35, 30),
+        analysed(AFTER_E4_E5, "g1f3", 30, 32),
+    ]
+    a4_game = [analysed(START_FEN, "a2a4", 20, -40)]
+    return [e4_game, e4_game, a4_game]
+
+
+@pytest.fixture
+def book(tmp_path):
+    path = tmp_path / "book.bin"
+    build_opening_book(corpus(), path, max_ply=2)
+    opening_book = OpeningBook(path, min_games=2)
+    yield opening_book
+    opening_book.close()
+
+
+class TestMoveEncoding:
+    @pytest.mark.parametrize("uci", ["e2e4", "g1f3", "e7e8q", "a2a1n", "h7h8r"])
+    def test_round_trip(self, uci):
+        move = chess.Move.from_uci(uci)
+        assert decode_move(encode_move(move)) == move
+
+
+class TestOpeningBook:
+    def test_max_ply_limits_positions(self, book):
+        # Start, after e4, after e4 e5 (evaluation only) and after a4.
+        assert len(book) == 4
+
+    def test_lookup(self, book):
+        entry = book.lookup(chess.Board())
+        assert entry is not None
+        assert entry.games == 3
+        assert entry.evaluation == {"type": "cp", "value": 27}
+        assert [(move.move_uci, move.count) for move in entry.moves] == [
+            ("e2e4", 2),
+            ("a2a4", 1),
+        ]
+        assert entry.moves[1].qualities[MoveQuality.MISTAKE] == 1
+
+    def test_unknown_position(self, book):
+        board = chess.Board()
+        board.push_uci("d2d4")
+        assert book.lookup(board) is None
+
+    def test_evaluations_for_well_known_position(self, book):
+        board = chess.Board()
+        assert book.evaluations(board, chess.Move.from_uci("e2e4")) == (
+            {"type": "cp", "value": 27},
+            {"type": "cp", "value": 35},
+        )
+        assert board.fen() == START_FEN
+
+    def test_no_evaluations_for_rare_position(self, book):
+        board = chess.Board(AFTER_E4_E5)
+        assert book.evaluations(board, chess.Move.from_uci("g1f3")) is None
+
+    def test_no_evaluations_for_illegal_move(self, book):
+        assert book.evaluations(chess.Board(), chess.Move.from_uci("e2e5")) is None
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "not_a_book.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            OpeningBook(path)
+
+
+@patch("src.chess.engine.ProfiledStockfish")
+def test_post_move_answered_from_book(mock_stockfish_class, book) -> None:
+    """Test that book positions skip the engine entirely."""
+    with patch("src.pipelines.post_move.get_opening_book", return_value=book):
+        analysis = analyze_post_move(START_FEN, "e2e4")
+
+    assert analysis == {
+        "before": {"type": "cp", "value": 27},
+        "after": {"type": "cp", "value": 35},
+        "delta": 8,
+    }
+    mock_stockfish_class.assert_not_called()
+
+
+@patch("src.chess.engine.ProfiledStockfish")
+def test_book_skipped_for_illegal_move_and_unknown_profile(mock_stockfish_class, book) -> None:
+    """Test that invalid input reaches the usual validation despite the book."""
+    engine = mock_stockfish_class.return_value
+    engine.get_evaluation.return_value = {"type": "cp", "value": 0}
+    with patch("src.pipelines.post_move.get_opening_book", return_value=book):
+        with pytest.raises(ValueError, match="Unknown engine profile"):
+            analyze_post_move(START_FEN, "e2e4", profile="nonexistent")
+        analyze_post_move(START_FEN, "e2e5")
+
+    engine.make_moves_from_current_position.assert_called_once_with(["e2e5"])
+
+
+def test_missing_book_not_cached(tmp_path, monkeypatch) -> None:
+    """Test that a book file created after a failed lookup is picked up."""
+    path = tmp_path / "later.bin"
+    monkeypatch.setattr("src.chess.opening_book._opening_book", None)
+    monkeypatch.setattr("src.chess.opening_book.settings.opening_book_path", str(path))
+    assert get_opening_book() is None
+
+    build_opening_book(corpus(), path, max_ply=2)
+    opened = get_opening_book()
+    assert opened is not None
+    assert get_opening_book() is opened
+    opened.close()
@@ -60,12 +60,11 @@ class TestCalculateDelta:
 
 
 class TestAnalyzePostMove:
-    @patch("src.pipelines.post_move.Stockfish")
+    @patch("src.chess.engine.ProfiledStockfish")
     def test_analyze_valid_move_white(self, mock_stockfish_class):
         # Setup mock
         mock_engine = Mock()
         mock_stockfish_class.return_value = mock_engine
-        mock_engine.is_fen_valid.return_value = True
         mock_engine.get_evaluation.side_effect = [
             {"type": "cp", "value": 50},
             {"type": "cp", "value": 100},
@@ -82,12 +81,11 @@ class TestAnalyzePostMove:
         mock_engine.set_fen_position.assert_called_once_with(fen)
         mock_engine.make_moves_from_current_position.assert_called_once_with([move])
 
-    @patch("src.pipelines.post_move.Stockfish")
+    @patch("src.chess.engine.ProfiledStockfish")
     def test_analyze_valid_move_black(self, mock_stockfish_class):
         # Setup mock
         mock_engine = Mock()
         mock_stockfish_class.return_value = mock_engine
-        mock_engine.is_fen_valid.return_value = True
         mock_engine.get_evaluation.side_effect = [
             {"type": "cp", "value": 50},
             {"type": "cp", "value": 100},
@@ -102,25 +100,21 @@ class TestAnalyzePostMove:
         assert result["after"] == {"type": "cp", "value": 100}
         assert result["delta"] == -50  # Negative because black to move
 
-    @patch("src.pipelines.post_move.Stockfish")
+    @patch("src.chess.engine.ProfiledStockfish")
     def test_analyze_invalid_fen(self, mock_stockfish_class):
         # Setup mock
-        mock_engine = Mock()
-        mock_stockfish_class.return_value = mock_engine
-        mock_engine.is_fen_valid.return_value = False
-
         fen = "invalid_fen"
         move = "e2e4"
 
         with pytest.raises(ValueError, match="Invalid Fen!"):
             analyze_post_move(fen, move)
+        mock_stockfish_class.assert_not_called()
 
-    @patch("src.pipelines.post_move.Stockfish")
+    @patch("src.chess.engine.ProfiledStockfish")
     def test_analyze_move_with_mate_evaluation(self, mock_stockfish_class):
         # Setup mock
         mock_engine = Mock()
         mock_stockfish_class.return_value = mock_engine
-        mock_engine.is_fen_valid.return_value = True
         mock_engine.get_evaluation.side_effect = [
             {"type": "cp", "value": 300},
             {"type": "mate", "value": 1},
@@ -135,12 +129,11 @@ class TestAnalyzePostMove:
         assert result["after"] == {"type": "mate", "value": 1}
         assert result["delta"] is None
 
-    @patch("src.pipelines.post_move.Stockfish")
+    @patch("src.chess.engine.ProfiledStockfish")
     def test_analyze_neutral_move(self, mock_stockfish_class):
         # Setup mock
         mock_engine = Mock()
         mock_stockfish_class.return_value = mock_engine
-        mock_engine.is_fen_valid.return_value = True
         mock_engine.get_evaluation.side_effect = [
             {"type": "cp", "value": 50},
             {"type": "cp", "value": 50},
@@ -153,12 +146,11 @@ class TestAnalyzePostMove:
 
         assert result["delta"] == 0
 
-    @patch("src.pipelines.post_move.Stockfish")
+    @patch("src.chess.engine.ProfiledStockfish")
     def test_analyze_blunder_move(self, mock_stockfish_class):
         # Setup mock
         mock_engine = Mock()
         mock_stockfish_class.return_value = mock_engine
-        mock_engine.is_fen_valid.return_value = True
         mock_engine.get_evaluation.side_effect = [
             {"type": "cp", "value": 100},
             {"type": "cp", "value": -200},
@@ -170,3 +162,22 @@ class TestAnalyzePostMove:
         result = analyze_post_move(fen, move)
 
         assert result["delta"] == -300  # Significant decline
+
+    @patch("src.chess.engine.ProfiledStockfish")
+    def test_engine_reused_across_calls(self, mock_stockfish_class):
+        mock_engine = Mock()
+        mock_stockfish_class.return_value = mock_engine
+        mock_engine.get_evaluation.return_value = {"type": "cp", "value": 0}
+
+        fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+        analyze_post_move(fen, "e2e4")
+        analyze_post_move(fen, "d2d4")
+
+        mock_stockfish_class.assert_called_once()
+
+    @patch("src.chess.engine.ProfiledStockfish")
+    def test_unknown_profile(self, mock_stockfish_class):
+        fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+        with pytest.raises(ValueError, match="Unknown engine profile"):
+            analyze_post_move(fen, "e2e4", profile="nonexistent")
+        mock_stockfish_class.assert_not_called()
@@ -0,0 +1,155 @@
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import get_profile_store
+from src.api.main import create_app
+from src.models.profiles import AnalysedGame, AnalysedMove
+from src.profiles import PlayerProfileStore, aggregate_game, game_phase
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+BLACK_FEN = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+MIDDLEGAME_FEN = "r1bq1rk1/pp2bppp/2n1pn2/3p4/3P4/2NBPN2/PP3PPP/R2QK2R w KQ - 0 15"
+ENDGAME_FEN = "8/5pk1/6p1/8/3R4/6P1/r4PK1/8 w - - 0 40"
+
+
+def make_move(fen: str, delta: int | None, clock: float | None = None) -> AnalysedMove:
+    return AnalysedMove(
+        fen_before=fen,
+        move_uci="e2e4",
+        before={"type": "cp", "value": 0},
+        after={"type": "cp", "value": delta if delta is not None else 0},
+        delta=delta,
+        clock_seconds=clock,
+    )
+
+
+def make_game(game_id: str = "g1") -> AnalysedGame:
+    return AnalysedGame(
+        game_id=game_id,
+        color="w",
+        opening="C20",
+        moves=[
+            make_move(START_FEN, 60),
+            make_move(BLACK_FEN, -300),  # opponent's move, ignored
+            make_move(MIDDLEGAME_FEN, -50, clock=12.0),
+            make_move(ENDGAME_FEN, -150, clock=5.0),
+        ],
+    )
+
+
+class TestGamePhase:
+    def test_opening(self):
+        assert game_phase(START_FEN) == "opening"
+
+    def test_middlegame(self):
+        assert game_phase(MIDDLEGAME_FEN) == "middlegame"
+
+    def test_endgame(self):
+        assert game_phase(ENDGAME_FEN) == "endgame"
+
+
+class TestAggregateGame:
+    def test_only_players_moves_are_counted(self):
+        buckets = aggregate_game(make_game(), time_pressure_seconds=30.0)
+        assert buckets[("overall", "")].moves == 3
+
+    def test_buckets(self):
+        buckets = aggregate_game(make_game(), time_pressure_seconds=30.0)
+        assert buckets[("phase", "opening")].good == 1
+        assert buckets[("phase", "middlegame")].mistake == 1
+        assert buckets[("phase", "endgame")].blunder == 1
+        assert buckets[("opening", "C20")].cp_loss == 200
+        assert buckets[("time_pressure", "")].moves == 2
+
+    def test_mate_moves_excluded_from_acpl(self):
+        game = AnalysedGame(
+            game_id="g",
+            color="w",
+            moves=[
+                AnalysedMove(
+                    fen_before=START_FEN,
+                    move_uci="e2e4",
+                    before={"type": "cp", "value": 300},
+                    after={"type": "mate", "value": 2},
+                )
+            ],
+        )
+        overall = aggregate_game(game, time_pressure_seconds=30.0)[("overall", "")]
+        assert overall.best == 1
+        assert overall.cp_moves == 0
+        assert overall.acpl is None
+
+
+class TestPlayerProfileStore:
+    def test_unknown_player(self, tmp_path):
+        store = PlayerProfileStore(tmp_path / "profiles.db")
+        assert store.get_profile("nobody") is None
+
+    def test_incremental_updates(self, tmp_path):
+        store = PlayerProfileStore(tmp_path / "profiles.db")
+        assert store.record_game("alice", make_game("g1")) is True
+        assert store.record_game("alice", make_game("g2")) is True
+
+        profile = store.get_profile("alice")
+        assert profile is not None
+        assert profile.games == 2
+        assert profile.overall.moves == 6
+        assert profile.phases["endgame"].blunder_rate == 1.0
+        assert profile.openings["C20"].acpl == 200 / 3
+        assert profile.time_pressure.mistake_rate == 1.0
+
+    def test_resubmitted_game_is_ignored(self, tmp_path):
+        store = PlayerProfileStore(tmp_path / "profiles.db")
+        store.record_game("alice", make_game("g1"))
+        assert store.record_game("alice", make_game("g1")) is False
+        profile = store.get_profile("alice")
+        assert profile is not None
+        assert profile.games == 1
+        assert profile.overall.moves == 3
+
+    def test_persists_across_instances(self, tmp_path):
+        PlayerProfileStore(tmp_path / "profiles.db").record_game("alice", make_game())
+        profile = PlayerProfileStore(tmp_path / "profiles.db").get_profile("alice")
+        assert profile is not None
+        assert profile.games == 1
+
+
+def test_profile_endpoints(tmp_path) -> None:
+    """Test recording a game and reading the profile back over the API."""
+    app = create_app()
+    store = PlayerProfileStore(tmp_path / "profiles.db")
+    app.dependency_overrides[get_profile_store] = lambda: store
+    client = TestClient(app)
+
+    assert client.get("/players/alice/profile").status_code == 404
+
+    response = client.post("/players/alice/games", json=make_game().model_dump())
+    assert response.status_code == 200
+    assert response.json() == {"recorded": True}
+
+    response = client.get("/players/alice/profile")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["games"] == 1
+    assert data["phases"]["endgame"]["blunder_rate"] == 1.0
+    assert data["openings"]["C20"]["acpl"] == 200 / 3
+
+
+def test_invalid_moves_rejected(tmp_path) -> None:
+    """Test that malformed FENs and evaluations are rejected with 422."""
+    app = create_app()
+    app.dependency_overrides[get_profile_store] = lambda: PlayerProfileStore(
+        tmp_path / "profiles.db"
+    )
+    client = TestClient(app)
+
+    for field, value in [
+        ("fen_before", "not a fen"),
+        ("fen_before", "8/8/8/8/8/8/8/K6k w"),
+        ("before", {}),
+        ("after", {"type": "pawns", "value": 1}),
+        ("move_uci", "e2"),
+    ]:
+        game = make_game().model_dump()
+        game["moves"][0][field] = value
+        response = client.post("/players/alice/games", json=game)
+        assert response.status_code == 422, (field, value)
@@ -0,0 +1,135 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import create_app
+from src.core import settings
+from src.core.profiling import RequestProfile, format_samples, stage, start_profile, stop_profile
+from src.pipelines.bulk import MEDIA_TYPE, encode_bulk_request
+
+FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def stage_names(header: str) -> list[str]:
+    return [metric.split(";")[0] for metric in header.split(", ")]
+
+
+class TestStage:
+    def test_no_op_without_profile(self):
+        with stage("search"):
+            pass
+        assert stage("search") is stage("other")
+
+    def test_records_bound_profile(self):
+        profile = RequestProfile()
+        token = start_profile(profile)
+        try:
+            with stage("search"):
+                pass
+        finally:
+            stop_profile(token)
+        with stage("ignored"):
+            pass
+        assert [name for name, _ in profile.stages] == ["search"]
+        assert stage_names(profile.server_timing()) == ["search", "total"]
+
+    def test_records_failed_stage(self):
+        profile = RequestProfile()
+        token = start_profile(profile)
+        with pytest.raises(ValueError), stage("validate_fen"):
+            raise ValueError("Invalid Fen!")
+        stop_profile(token)
+        assert profile.stages[0][0] == "validate_fen"
+
+    def test_samples_the_staged_thread(self):
+        profile = RequestProfile(sample_interval_ms=1)
+        token = start_profile(profile)
+        with stage("search"):
+            time.sleep(0.05)
+        stop_profile(token)
+        samples = profile.finish()
+        assert samples
+        assert "test_samples_the_staged_thread" in format_samples(samples)
+
+
+@pytest.fixture
+def mock_engine():
+    with patch("src.chess.engine.ProfiledStockfish") as mock_stockfish_class:
+        engine = Mock()
+        mock_stockfish_class.return_value = engine
+        engine.get_evaluation.side_effect = [
+            {"type": "cp", "value": 20},
+            {"type": "cp", "value": 30},
+        ]
+        yield engine
+
+
+def test_profile_header(mock_engine, monkeypatch) -> None:
+    """Test the stage breakdown returned for requests asking for a profile."""
+    monkeypatch.setattr(settings, "profiling_header_enabled", True)
+    client = TestClient(create_app())
+    request = {"fen_before": FEN, "move_uci": "e2e4"}
+
+    response = client.post("/analysis/move", json=request, headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert stage_names(response.headers["Server-Timing"]) == [
+        "opening_book",
+        "cache",
+        "validate_fen",
+        "engine_checkout",
+        "set_fen_position",
+        "search_before",
+        "make_moves",
+        "search_after",
+        "calculate_delta",
+        "classify_move",
+        "total",
+    ]
+
+    response = client.post("/analysis/move", json=request)
+    assert "Server-Timing" not in response.headers
+
+
+def test_profiling_disabled(mock_engine) -> None:
+    """Test that the header is ignored unless profiling is enabled."""
+    client = TestClient(create_app())
+    response = client.post(
+        "/analysis/move", json={"fen_before": FEN, "move_uci": "e2e4"}, headers={"X-Profile": "1"}
+    )
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+
+
+def test_slow_requests_log_samples(mock_engine, monkeypatch) -> None:
+    """Test that profiled requests above the threshold log their stack samples."""
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_slow_ms", 1)
+    monkeypatch.setattr(settings, "profiling_sample_interval_ms", 1)
+    mock_engine.get_evaluation.side_effect = lambda: time.sleep(0.02) or {"type": "cp", "value": 0}
+    client = TestClient(create_app())
+
+    with patch("src.api.profiling.logger") as mock_logger:
+        response = client.post("/analysis/move", json={"fen_before": FEN, "move_uci": "e2e4"})
+
+    assert response.status_code == 200
+    message = mock_logger.warning.call_args.args[0]
+    assert message.startswith("Slow request POST /analysis/move")
+    assert "analyze_post_move" in message
+
+
+def test_streamed_body_logged_after_it_ends(mock_engine, monkeypatch) -> None:
+    """Test that stages of a streamed body are logged once the body is sent."""
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    client = TestClient(create_app())
+    body = encode_bulk_request([(FEN, "e2e4")])
+
+    with patch("src.api.profiling.logger") as mock_logger:
+        response = client.post("/analysis/bulk", content=body, headers={"Content-Type": MEDIA_TYPE})
+
+    assert response.status_code == 200
+    assert "search_after" not in stage_names(response.headers["Server-Timing"])
+    message = mock_logger.info.call_args.args[0]
+    assert message.startswith("Streamed request POST /analysis/bulk")
+    assert "search_after;dur=" in message
@@ -0,0 +1,194 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.classification.move_quality import MoveQuality
+from src.loadtest.harness import FakeEngineConfig, random_games, write_engine_script
+from src.models.profiles import AnalysedMove
+from src.models.puzzles import Puzzle
+from src.pipelines import puzzles
+from src.pipelines.puzzles import line_score, mine_puzzles, read_moves, verify_candidate
+from src.puzzles import PuzzleStore, normalize_position
+
+FEN = "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+OTHER_FEN = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2"
+
+
+def make_move(fen: str = FEN, delta: int = -400, move: str = "h5h3") -> AnalysedMove:
+    return AnalysedMove(
+        fen_before=fen,
+        move_uci=move,
+        before={"type": "cp", "value": 300},
+        after={"type": "cp", "value": 300 + delta},
+        delta=delta,
+    )
+
+
+def make_engine(*top_moves: dict) -> Mock:
+    engine = Mock()
+    engine.get_top_moves.return_value = list(top_moves)
+    return engine
+
+
+UNIQUE = (
+    {"Move": "h5f7", "Centipawn": None, "Mate": 1},
+    {"Move": "d2d3", "Centipawn": 40, "Mate": None},
+)
+
+
+class TestLineScore:
+    def test_centipawn_is_mover_relative(self):
+        line = {"Move": "e7e5", "Centipawn": -50, "Mate": None}
+        assert line_score(line, "w") == -50
+        assert line_score(line, "b") == 50
+
+    def test_mates_rank_above_centipawns(self):
+        mate_in_3 = line_score({"Move": "a", "Centipawn": None, "Mate": 3}, "w")
+        mate_in_1 = line_score({"Move": "b", "Centipawn": None, "Mate": 1}, "w")
+        winning = line_score({"Move": "c", "Centipawn": 900, "Mate": None}, "w")
+        mated = line_score({"Move": "d", "Centipawn": None, "Mate": -2}, "w")
+        assert mate_in_1 > mate_in_3 > winning > mated
+
+
+class TestVerifyCandidate:
+    def test_unique_solution(self):
+        puzzle = verify_candidate(
+            make_engine(*UNIQUE), "alice", make_move(), MoveQuality.BLUNDER, 150
+        )
+        assert puzzle is not None
+        assert puzzle.solution == "h5f7"
+        assert puzzle.played_move == "h5h3"
+        assert puzzle.position == normalize_position(FEN)
+
+    def test_two_good_replies_rejected(self):
+        engine = make_engine(
+            {"Move": "h5f7", "Centipawn": 500, "Mate": None},
+            {"Move": "c4f7", "Centipawn": 420, "Mate": None},
+        )
+        assert verify_candidate(engine, None, make_move(), MoveQuality.BLUNDER, 150) is None
+
+    def test_forced_move_rejected(self):
+        engine = make_engine(UNIQUE[0])
+        assert verify_candidate(engine, None, make_move(), MoveQuality.BLUNDER, 150) is None
+
+
+class TestPuzzleStore:
+    def test_normalize_drops_move_counters(self):
+        assert normalize_position(FEN) == normalize_position(FEN.replace(" 4 4", " 10 20"))
+
+    def test_add_many_deduplicates(self, tmp_path):
+        store = PuzzleStore(tmp_path / "puzzles.db")
+        puzzle = Puzzle(
+            position=normalize_position(FEN),
+            fen=FEN,
+            solution="h5f7",
+            played_move="h5h3",
+            quality=MoveQuality.BLUNDER,
+            gap_cp=500,
+            player_id="alice",
+        )
+        assert store.add_many([puzzle, puzzle]) == 1
+        assert store.contains(puzzle.position)
+        assert store.for_player("alice") == [puzzle]
+
+
+class TestMinePuzzles:
+    def test_only_mistakes_are_verified(self, tmp_path):
+        store = PuzzleStore(tmp_path / "puzzles.db")
+        engine = make_engine(*UNIQUE)
+        moves = [("alice", make_move(delta=10)), ("alice", make_move())]
+
+        stats = mine_puzzles(iter(moves), store, engine=engine)
+
+        assert engine.get_top_moves.call_count == 1
+        assert (stats.moves, stats.candidates, stats.stored) == (2, 1, 1)
+
+    def test_known_positions_skip_verification(self, tmp_path):
+        store = PuzzleStore(tmp_path / "puzzles.db")
+        engine = make_engine(*UNIQUE)
+        mine_puzzles(iter([("alice", make_move())]), store, engine=engine)
+
+        stats = mine_puzzles(iter([("bob", make_move())]), store, engine=engine)
+
+        assert engine.get_top_moves.call_count == 1
+        assert stats.duplicates == 1
+        assert len(store) == 1
+
+    @pytest.mark.parametrize("batch_size", [1, 3])
+    def test_duplicates_within_a_batch(self, tmp_path, batch_size):
+        store = PuzzleStore(tmp_path / "puzzles.db")
+        moves = [("alice", make_move()), ("bob", make_move()), ("carol", make_move(OTHER_FEN))]
+
+        stats = mine_puzzles(iter(moves), store, batch_size=batch_size, engine=make_engine(*UNIQUE))
+
+        assert stats.stored == 2
+        assert stats.duplicates == 1
+
+    def test_rejected_candidates_counted(self, tmp_path):
+        store = PuzzleStore(tmp_path / "puzzles.db")
+        engine = make_engine(UNIQUE[0])
+        stats = mine_puzzles(iter([("alice", make_move())]), store, engine=engine)
+        assert stats.rejected == 1
+        assert len(store) == 0
+
+    def test_invalid_records_skipped(self, tmp_path):
+        store = PuzzleStore(tmp_path / "puzzles.db")
+        broken = make_move().model_copy(update={"fen_before": "8/8 w"})
+        moves = [("alice", broken), ("alice", make_move())]
+
+        stats = mine_puzzles(iter(moves), store, engine=make_engine(*UNIQUE))
+
+        assert (stats.moves, stats.invalid, stats.stored) == (2, 1, 1)
+
+    def test_engine_failure_skips_candidate(self, tmp_path):
+        store = PuzzleStore(tmp_path / "puzzles.db")
+        engine = make_engine(*UNIQUE)
+        engine.get_top_moves.side_effect = [BrokenPipeError(), list(UNIQUE)]
+        moves = [("alice", make_move()), ("bob", make_move(OTHER_FEN))]
+
+        stats = mine_puzzles(iter(moves), store, engine=engine)
+
+        assert (stats.invalid, stats.stored) == (1, 1)
+
+    def test_worker_engine_replaced_after_crash(self):
+        engine = make_engine(*UNIQUE)
+        engine.get_top_moves.side_effect = BrokenPipeError()
+        with patch("src.pipelines.puzzles.ProfiledStockfish") as mock_stockfish_class:
+            puzzles._init_worker("/bin/stockfish", puzzles.verification_profile())
+            puzzles._worker_engine = engine
+            result = puzzles._verify_in_worker(("alice", make_move(), MoveQuality.BLUNDER, 50))
+
+        assert isinstance(result, str)
+        assert puzzles._worker_engine is mock_stockfish_class.return_value
+
+
+def test_mine_puzzles_with_worker_pool(tmp_path, monkeypatch) -> None:
+    """Test the multiprocessing path against the fake engine."""
+    script = write_engine_script(FakeEngineConfig(latency_ms=1, score_stddev=300), tmp_path)
+    monkeypatch.setattr("src.pipelines.puzzles.settings.stockfish_path", str(script))
+    store = PuzzleStore(tmp_path / "puzzles.db")
+    moves = [("alice", make_move(fen, move=move)) for fen, move in random_games(4, 10, seed=2)[0]]
+    moves.append(("alice", make_move().model_copy(update={"fen_before": "8/8 w"})))
+
+    stats = mine_puzzles(iter(moves), store, workers=2, batch_size=4)
+
+    assert stats.moves == len(moves)
+    assert stats.invalid == 1
+    assert stats.candidates > 0
+    assert stats.stored + stats.rejected + stats.duplicates == stats.candidates
+    assert stats.stored == len(store)
+
+
+def test_read_moves() -> None:
+    """Test parsing an archive of JSON lines."""
+    line = make_move().model_dump_json()
+    records = list(read_moves(['{"player_id": "alice", ' + line[1:], "", line]))
+    assert [player_id for player_id, _ in records] == ["alice", None]
+    assert records[0][1] == make_move()
+
+
+def test_read_moves_skips_malformed_lines() -> None:
+    """Test that a malformed line does not end the archive."""
+    line = make_move().model_dump_json()
+    records = list(read_moves(["{", "[]", line.replace("h5h3", "h5"), line]))
+    assert [move for _, move in records] == [make_move()]
@@ -0,0 +1,262 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.dependencies import get_session_manager
+from src.api.main import create_app
+from src.chess.cache import EvaluationCache
+from src.chess.engine import EnginePool
+from src.core.config import EngineProfile
+from src.sessions import SessionCapacityError, SessionManager, SessionNotFoundError
+from src.sessions.manager import ENGINE_BASE_MB, GameSession
+
+PROFILES = {"blitz": EngineProfile(depth=8), "deep": EngineProfile(depth=20, hash_mb=256)}
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+@pytest.fixture
+def mock_engine():
+    engine = Mock()
+    engine.get_evaluation.side_effect = [
+        {"type": "cp", "value": 30},
+        {"type": "cp", "value": 40},
+        {"type": "cp", "value": -60},
+    ]
+    with patch("src.sessions.manager.ProfiledStockfish", return_value=engine):
+        yield engine
+
+
+@pytest.fixture
+def pool():
+    return EnginePool("/bin/stockfish", PROFILES, "blitz")
+
+
+class TestGameSession:
+    def test_invalid_fen(self, mock_engine, pool):
+        with pytest.raises(ValueError):
+            GameSession("blitz", pool, start_fen="not a fen")
+
+    def test_illegal_move(self, mock_engine, pool):
+        session = GameSession("blitz", pool, cache=EvaluationCache(10))
+        with pytest.raises(ValueError):
+            session.play("e2e5")
+        assert session.moves == []
+
+    def test_moves_sent_as_position_deltas(self, mock_engine, pool):
+        positions = []
+        mock_engine.set_game_position.side_effect = lambda moves, fen: positions.append(
+            (list(moves), fen)
+        )
+        session = GameSession("blitz", pool, cache=EvaluationCache(10))
+        session.play("e2e4")
+        session.play("e7e5")
+
+        assert positions == [
+            ([], None),
+            (["e2e4"], None),
+            (["e2e4", "e7e5"], None),
+        ]
+        mock_engine.set_fen_position.assert_not_called()
+        mock_engine.is_fen_valid.assert_not_called()
+
+    def test_previous_evaluation_reused(self, mock_engine, pool):
+        session = GameSession("blitz", pool, cache=EvaluationCache(10))
+        first, side = session.play("e2e4")
+        second, next_side = session.play("e7e5")
+
+        assert (side, next_side) == ("w", "b")
+        assert first == {
+            "before": {"type": "cp", "value": 30},
+            "after": {"type": "cp", "value": 40},
+            "delta": 10,
+        }
+        assert second["before"] == first["after"]
+        assert second["delta"] == 100
+        assert mock_engine.get_evaluation.call_count == 3
+
+    def test_cached_move_skips_engine(self, mock_engine, pool):
+        cache = EvaluationCache(10)
+        cached = {"before": {"type": "cp", "value": 0}, "after": {"type": "cp", "value": 5}}
+        cache.put("blitz", START_FEN, "e2e4", {**cached, "delta": 5})
+        session = GameSession("blitz", pool, cache=cache)
+
+        analysis, _ = session.play("e2e4")
+
+        assert analysis["delta"] == 5
+        mock_engine.get_evaluation.assert_not_called()
+        assert session.fen.split()[1] == "b"
+
+    def test_results_kept_out_of_shared_cache(self, mock_engine, pool):
+        cache = EvaluationCache(10)
+        session = GameSession("blitz", pool, cache=cache)
+        session.play("e2e4")
+        assert len(cache) == 0
+
+    def test_crashed_engine_is_replaced(self, mock_engine, pool):
+        session = GameSession("blitz", pool, cache=EvaluationCache(10))
+        session.play("e2e4")
+        mock_engine.get_evaluation.side_effect = [BrokenPipeError(), {"type": "cp", "value": 5}]
+
+        analysis, _ = session.play("e7e5")
+
+        assert analysis["after"] == {"type": "cp", "value": 5}
+        mock_engine.quit.assert_called_once()
+        mock_engine.set_game_position.assert_called_with(["e2e4", "e7e5"], None)
+
+    def test_engine_failing_after_restart(self, mock_engine, pool):
+        session = GameSession("blitz", pool, cache=EvaluationCache(10))
+        mock_engine.get_evaluation.side_effect = BrokenPipeError()
+        with pytest.raises(BrokenPipeError):
+            session.play("e2e4")
+        assert session.moves == []
+
+    def test_closed_session_refuses_moves(self, mock_engine, pool):
+        session = GameSession("blitz", pool, cache=EvaluationCache(10))
+        session.close()
+        with pytest.raises(SessionNotFoundError):
+            session.play("e2e4")
+        mock_engine.get_evaluation.assert_not_called()
+
+    def test_closed_session_engine_not_restarted(self, mock_engine, pool):
+        session = GameSession("blitz", pool, cache=EvaluationCache(10))
+        session.closed = True
+        mock_engine.get_evaluation.side_effect = BrokenPipeError()
+        with patch("src.sessions.manager.ProfiledStockfish") as mock_stockfish_class, pytest.raises(
+            BrokenPipeError
+        ):
+            session._evaluate()
+        mock_stockfish_class.assert_not_called()
+
+    def test_custom_start_position(self, mock_engine, pool):
+        fen = "8/5pk1/6p1/8/3R4/6P1/r4PK1/8 w - - 0 40"
+        session = GameSession("blitz", pool, start_fen=fen, cache=EvaluationCache(10))
+        session.play("d4d7")
+        mock_engine.set_game_position.assert_called_with(["d4d7"], fen)
+
+    @patch("src.sessions.manager.SpeculativeAnalyzer")
+    def test_speculation_follows_the_game(self, mock_analyzer_class, mock_engine, pool):
+        analyzer = mock_analyzer_class.return_value
+        session = GameSession("blitz", pool, cache=EvaluationCache(10), speculate=True)
+        analyzer.start.assert_called_once_with(START_FEN)
+
+        session.play("e2e4")
+
+        analyzer.cancel.assert_called_once()
+        analyzer.start.assert_called_with(session.fen)
+        session.close()
+        analyzer.close.assert_called_once()
+
+
+class TestSessionManager:
+    def test_get_unknown(self, mock_engine, pool):
+        with pytest.raises(SessionNotFoundError):
+            SessionManager(pool).get("missing")
+
+    def test_close(self, mock_engine, pool):
+        manager = SessionManager(pool)
+        session = manager.open()
+        manager.close(session.session_id)
+        mock_engine.quit.assert_called_once()
+        with pytest.raises(SessionNotFoundError):
+            manager.get(session.session_id)
+
+    def test_idle_expiry(self, mock_engine, pool):
+        manager = SessionManager(pool, idle_seconds=60)
+        with patch("src.sessions.manager.time.monotonic", return_value=1000.0):
+            session = manager.open()
+        with patch("src.sessions.manager.time.monotonic", return_value=1100.0), pytest.raises(
+            SessionNotFoundError
+        ):
+            manager.get(session.session_id)
+        mock_engine.quit.assert_called_once()
+
+    def test_expire_closes_idle_sessions(self, mock_engine, pool):
+        manager = SessionManager(pool, idle_seconds=60)
+        with patch("src.sessions.manager.time.monotonic", return_value=1000.0):
+            manager.open()
+        with patch("src.sessions.manager.time.monotonic", return_value=1100.0):
+            assert manager.expire() == 1
+        assert len(manager) == 0
+        mock_engine.quit.assert_called_once()
+
+    def test_memory_cap_evicts_least_recently_used(self, mock_engine, pool):
+        manager = SessionManager(pool, memory_mb=3 * (ENGINE_BASE_MB + 16))
+        first = manager.open()
+        second = manager.open()
+        third = manager.open()
+        manager.get(first.session_id)
+
+        manager.open()
+
+        assert len(manager) == 3
+        manager.get(first.session_id)
+        manager.get(third.session_id)
+        with pytest.raises(SessionNotFoundError):
+            manager.get(second.session_id)
+
+    def test_session_larger_than_budget(self, mock_engine, pool):
+        manager = SessionManager(pool, memory_mb=ENGINE_BASE_MB + 16)
+        with pytest.raises(SessionCapacityError):
+            manager.open(profile="deep")
+
+    def test_budget_reserved_while_opening(self, mock_engine, pool):
+        manager = SessionManager(pool, memory_mb=ENGINE_BASE_MB + 16)
+        nested = []
+
+        def open_concurrently(*args):
+            with pytest.raises(SessionCapacityError):
+                manager.open()
+            nested.append(manager.used_memory_mb)
+            return mock_engine
+
+        with patch("src.sessions.manager.ProfiledStockfish", side_effect=open_concurrently):
+            manager.open()
+
+        assert nested == [ENGINE_BASE_MB + 16]
+        assert len(manager) == 1
+        assert manager.used_memory_mb == ENGINE_BASE_MB + 16
+
+
+def test_session_endpoints(mock_engine, pool) -> None:
+    """Test a live session over the API."""
+    app = create_app()
+    manager = SessionManager(pool)
+    app.dependency_overrides[get_session_manager] = lambda: manager
+    client = TestClient(app)
+
+    response = client.post("/sessions", json={})
+    assert response.status_code == 201
+    session_id = response.json()["session_id"]
+    assert response.json()["fen"] == START_FEN
+
+    response = client.post(f"/sessions/{session_id}/moves", json={"move_uci": "e2e4"})
+    assert response.status_code == 200
+    assert response.json()["quality"] == "inaccuracy"
+
+    response = client.post(f"/sessions/{session_id}/moves", json={"move_uci": "e2e4"})
+    assert response.status_code == 400
+
+    mock_engine.get_evaluation.side_effect = BrokenPipeError()
+    response = client.post(f"/sessions/{session_id}/moves", json={"move_uci": "e7e5"})
+    assert response.status_code == 503
+
+    assert client.get(f"/sessions/{session_id}").json()["moves"] == ["e2e4"]
+    assert client.delete(f"/sessions/{session_id}").status_code == 204
+    assert client.get(f"/sessions/{session_id}").status_code == 404
+    assert client.post("/sessions", json={"fen": "bad"}).status_code == 400
+
+
+def test_idle_sessions_reaped_in_background(monkeypatch) -> None:
+    """Test that the app closes idle sessions without further requests."""
+    manager = Mock()
+    manager.expire.return_value = 1
+    monkeypatch.setattr("src.api.main.get_session_manager", lambda: manager)
+    monkeypatch.setattr("src.api.main.settings.session_reap_seconds", 0.01)
+
+    with TestClient(create_app()):
+        time.sleep(0.1)
+
+    assert manager.expire.call_count > 1
+    manager.close_all.assert_called_once()
@@ -0,0 +1,155 @@
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.chess.cache import EvaluationCache, evaluation_cache
+from src.chess.engine import EnginePool, ProfiledStockfish
+from src.core.config import EngineProfile
+from src.loadtest.harness import FakeEngineConfig, write_engine_script
+from src.pipelines.post_move import analyze_post_move
+from src.pipelines.speculative import SpeculativeAnalyzer
+
+FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+PROFILES = {"blitz": EngineProfile(depth=8), "timed": EngineProfile(movetime_ms=100)}
+
+
+@pytest.fixture
+def mock_engine():
+    engine = Mock()
+    engine.get_evaluation.side_effect = [
+        {"type": "cp", "value": 30},
+        {"type": "cp", "value": 40},
+        {"type": "cp", "value": 10},
+    ]
+    engine.get_top_moves.return_value = [
+        {"Move": "e2e4", "Centipawn": 40, "Mate": None},
+        {"Move": "d2d4", "Centipawn": 10, "Mate": None},
+    ]
+    with patch("src.pipelines.speculative.ProfiledStockfish", return_value=engine), patch(
+        "src.pipelines.speculative.os.setpriority"
+    ):
+        yield engine
+
+
+class TestEvaluationCache:
+    def test_miss(self):
+        assert EvaluationCache(2).get("blitz", FEN, "e2e4") is None
+
+    def test_keyed_by_profile(self):
+        cache = EvaluationCache(2)
+        cache.put("blitz", FEN, "e2e4", {"delta": 5})
+        assert cache.get("blitz", FEN, "e2e4") == {"delta": 5}
+        assert cache.get("deep", FEN, "e2e4") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = EvaluationCache(2)
+        cache.put("blitz", FEN, "e2e4", {"delta": 1})
+        cache.put("blitz", FEN, "d2d4", {"delta": 2})
+        cache.get("blitz", FEN, "e2e4")
+        cache.put("blitz", FEN, "c2c4", {"delta": 3})
+        assert len(cache) == 2
+        assert cache.get("blitz", FEN, "d2d4") is None
+        assert cache.get("blitz", FEN, "e2e4") == {"delta": 1}
+
+    def test_counts_lookups(self):
+        cache = EvaluationCache(2)
+        cache.put("blitz", FEN, "e2e4", {"delta": 5})
+        cache.get("blitz", FEN, "e2e4")
+        cache.get("blitz", FEN, "d2d4")
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.clear()
+        assert (cache.hits, cache.misses) == (0, 0)
+
+
+class TestSpeculativeAnalyzer:
+    def test_movetime_profile(self, mock_engine):
+        cache = EvaluationCache(10)
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        analyzer = SpeculativeAnalyzer("timed", candidates=2, cache=cache, pool=pool)
+        assert analyzer.analyze(FEN, threading.Event()) == 2
+        assert cache.get("timed", FEN, "e2e4") is not None
+
+    def test_caches_top_candidates(self, mock_engine):
+        cache = EvaluationCache(10)
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        analyzer = SpeculativeAnalyzer(candidates=2, cache=cache, pool=pool)
+
+        assert analyzer.analyze(FEN, threading.Event()) == 2
+
+        mock_engine.get_top_moves.assert_called_once_with(2)
+        assert cache.get("blitz", FEN, "e2e4") == {
+            "before": {"type": "cp", "value": 30},
+            "after": {"type": "cp", "value": 40},
+            "delta": 10,
+        }
+        assert cache.get("blitz", FEN, "d2d4")["delta"] == -20
+
+    def test_cancelled_search_not_cached(self, mock_engine):
+        cache = EvaluationCache(10)
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        analyzer = SpeculativeAnalyzer(cache=cache, pool=pool)
+        cancelled = threading.Event()
+
+        def evaluate_then_cancel():
+            if mock_engine.get_evaluation.call_count == 2:
+                cancelled.set()
+            return {"type": "cp", "value": 0}
+
+        mock_engine.get_evaluation.side_effect = evaluate_then_cancel
+
+        assert analyzer.analyze(FEN, cancelled) == 0
+        assert len(cache) == 0
+
+    def test_background_run_and_cancel(self, mock_engine):
+        cache = EvaluationCache(10)
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        analyzer = SpeculativeAnalyzer(cache=cache, pool=pool)
+
+        analyzer.start(FEN)
+        analyzer.wait(timeout=5)
+        assert len(cache) == 2
+
+        analyzer.cancel()
+        mock_engine.stop.assert_called_once()
+
+    def test_failed_engine_is_recreated(self, mock_engine):
+        pool = EnginePool("/bin/stockfish", PROFILES, "blitz")
+        analyzer = SpeculativeAnalyzer(cache=EvaluationCache(10), pool=pool)
+        mock_engine.get_evaluation.side_effect = BrokenPipeError()
+
+        analyzer.start(FEN)
+        analyzer.wait(timeout=5)
+
+        assert analyzer._engine is None
+
+
+def test_search_after_cancel_is_trivial(tmp_path) -> None:
+    """Test that a search starting after cancellation cannot miss its stop."""
+    script = write_engine_script(FakeEngineConfig(latency_ms=1), tmp_path)
+    engine = ProfiledStockfish(str(script), EngineProfile(depth=20))
+    try:
+        engine._put = Mock(wraps=engine._put)
+        engine.cancelled = threading.Event()
+        engine.set_fen_position(FEN)
+        engine.get_evaluation()
+        engine.cancelled.set()
+        engine.stop()
+        engine.get_evaluation()
+    finally:
+        engine.quit()
+    commands = [call.args[0] for call in engine._put.call_args_list]
+    assert [command for command in commands if command.startswith("go")] == [
+        "go depth 20",
+        "go depth 1",
+    ]
+
+
+@patch("src.chess.engine.ProfiledStockfish")
+def test_post_move_served_from_cache(mock_stockfish_class) -> None:
+    """Test that pre-analysed moves skip the engine entirely."""
+    analysis = {"before": {"type": "cp", "value": 0}, "after": {"type": "cp", "value": 0}}
+    evaluation_cache.put("standard", FEN, "e2e4", {**analysis, "delta": 0})
+
+    assert analyze_post_move(FEN, "e2e4")["delta"] == 0
+    mock_stockfish_class.assert_not_called()